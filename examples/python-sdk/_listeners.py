@@ -0,0 +1,126 @@
+"""
+Shared event listener for the AuggieACPClient examples.
+
+Used by acp_demo.py and demo_session_continuity.py (compact output) and
+acp_example_usage.py (verbose output).
+"""
+
+from auggie_sdk.acp import AgentEventListener
+from typing import Optional, Any
+import reprlib
+import sys
+import time
+
+# Tool responses can be whole files; reprlib gives up after a few items and
+# characters instead of rendering the full object first
+_content_repr = reprlib.Repr()
+_content_repr.maxstring = 100
+_content_repr.maxother = 100
+
+
+def preview_content(content: Any, limit: int = 100) -> str:
+    """Return a short preview of tool response content (at most limit chars)."""
+    if isinstance(content, str):
+        return content[:limit]
+    return _content_repr.repr(content)[:limit]
+
+
+def send(client: Any, listener: "PrintingListener", message: str, **kwargs: Any) -> str:
+    """Send a message, then write out whatever the listener still buffers.
+
+    The flush runs even if send_message() raises or times out, so the tail of
+    a streamed response is never lost or printed after later output.
+    """
+    try:
+        return client.send_message(message, **kwargs)
+    finally:
+        listener.flush()
+
+
+class PrintingListener(AgentEventListener):
+    """Prints agent events to stdout.
+
+    With verbose=False only the streamed response and short tool notices are
+    shown; with verbose=True every event is printed with a label and details.
+    """
+
+    # Streamed chunks are coalesced and written out once this many characters
+    # are pending or this many seconds have passed since the last flush.
+    FLUSH_SIZE = 256
+    FLUSH_INTERVAL = 0.05
+
+    def __init__(self, verbose: bool = False) -> None:
+        self.verbose = verbose
+        self._message_prefix = "[AGENT MESSAGE] " if verbose else ""
+        self._buf: list[str] = []
+        self._buf_size = 0
+        self._last_flush = time.monotonic()
+
+    def _write(self, text: str) -> None:
+        """Buffer text and flush it if the size or time threshold is reached."""
+        self._buf.append(text)
+        self._buf_size += len(text)
+        if (
+            self._buf_size >= self.FLUSH_SIZE
+            or time.monotonic() - self._last_flush > self.FLUSH_INTERVAL
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Write out any buffered text.
+
+        Call this after send_message() returns or raises: on_agent_message()
+        does not fire when a message fails or times out.
+        """
+        if self._buf:
+            sys.stdout.write("".join(self._buf))
+            self._buf.clear()
+            self._buf_size = 0
+        sys.stdout.flush()
+        self._last_flush = time.monotonic()
+
+    def on_agent_message_chunk(self, text: str) -> None:
+        """Called when the agent sends a message chunk."""
+        self._write(self._message_prefix + text)
+
+    def on_agent_message(self, message: str) -> None:
+        """Called once the complete message has been received."""
+        self.flush()
+
+    def on_tool_call(
+        self,
+        tool_call_id: str,
+        title: str,
+        kind: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> None:
+        """Called when the agent starts a tool call."""
+        self.flush()
+        if self.verbose:
+            print(f"\n[TOOL CALL START] {title}")
+            print(f"  ID: {tool_call_id}")
+            print(f"  Kind: {kind}")
+            print(f"  Status: {status}")
+        else:
+            print(f"\n  🔧 Using tool: {title}", flush=True)
+
+    def on_tool_response(
+        self,
+        tool_call_id: str,
+        status: Optional[str] = None,
+        content: Optional[Any] = None,
+    ) -> None:
+        """Called when a tool response is received."""
+        self.flush()
+        if self.verbose:
+            print(f"[TOOL RESPONSE] {tool_call_id}")
+            print(f"  Status: {status}")
+            if content:
+                print(f"  Content: {preview_content(content)}...")  # Truncate long content
+        elif status == "completed":
+            print("  ✓ Tool completed", flush=True)
+
+    def on_agent_thought(self, text: str) -> None:
+        """Called when the agent shares its internal reasoning."""
+        if self.verbose:
+            self._write(f"[AGENT THOUGHT] {text}")
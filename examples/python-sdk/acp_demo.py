@@ -9,40 +9,13 @@ This demonstrates the four key features:
 4. Clearing context
 """
 
-from auggie_sdk.acp import AuggieACPClient, AgentEventListener
-from typing import Optional, Any
-
-
-class DemoListener(AgentEventListener):
-    """Simple listener that prints events in a user-friendly way."""
-
-    def on_agent_message_chunk(self, text: str) -> None:
-        """Called when the agent sends a message chunk."""
-        print(text, end="", flush=True)
-
-    def on_tool_call(
-        self,
-        tool_call_id: str,
-        title: str,
-        kind: Optional[str] = None,
-        status: Optional[str] = None,
-    ) -> None:
-        """Called when the agent starts a tool call."""
-        print(f"\n  🔧 Using tool: {title}", flush=True)
-
-    def on_tool_response(
-        self,
-        tool_call_id: str,
-        status: Optional[str] = None,
-        content: Optional[Any] = None,
-    ) -> None:
-        """Called when a tool response is received."""
-        if status == "completed":
-            print("  ✓ Tool completed", flush=True)
-
-    def on_agent_thought(self, text: str) -> None:
-        """Called when the agent shares a thought."""
-        pass
+from auggie_sdk.acp import AuggieACPClient
+import os
+
+from _listeners import PrintingListener, send
+
+# Per-call timeout (seconds) for send_message(); override with AUGGIE_TIMEOUT
+DEFAULT_SEND_TIMEOUT = float(os.getenv("AUGGIE_TIMEOUT", "60"))
 
 
 def main():
@@ -51,7 +24,7 @@ def main():
     print("=" * 80)
 
     # Create client with event listener
-    listener = DemoListener()
+    listener = PrintingListener(verbose=False)
     client = AuggieACPClient(listener=listener)
 
     # Feature 1: Start the agent
@@ -62,15 +35,22 @@ def main():
     # Feature 2: Send messages and get responses
     print("2️⃣  Sending message: 'What is 2 + 2?'\n")
     print("   Agent response: ", end="")
-    client.send_message("What is 2 + 2? Answer in one sentence.")
+    send(
+        client,
+        listener,
+        "What is 2 + 2? Answer in one sentence.",
+        timeout=DEFAULT_SEND_TIMEOUT,
+    )
     print("\n   ✓ Got response\n")
 
     # Feature 3: Events are automatically captured by the listener
     print("3️⃣  Sending message that triggers tool calls: 'Read the README.md'\n")
     print("   Agent response: ", end="")
-    client.send_message(
+    send(
+        client,
+        listener,
         "Read the README.md file in the current directory and tell me what it's about in one sentence.",
-        timeout=30.0,
+        timeout=DEFAULT_SEND_TIMEOUT,
     )
     print("\n   ✓ Got response (with tool call events shown above)\n")
 
@@ -86,7 +66,12 @@ def main():
     # Verify context was cleared
     print("   Verifying context was cleared...")
     print("   Agent response: ", end="")
-    client.send_message("What was the last file I asked you to read?")
+    send(
+        client,
+        listener,
+        "What was the last file I asked you to read?",
+        timeout=DEFAULT_SEND_TIMEOUT,
+    )
     print("\n   ✓ Agent doesn't remember (context was cleared)\n")
 
     # Stop the agent
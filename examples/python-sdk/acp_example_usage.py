@@ -8,45 +8,14 @@ This demonstrates all the key features:
 4. Clearing context
 """
 
-from auggie_sdk.acp import AuggieACPClient, AgentEventListener
-from typing import Optional, Any
-
-
-class MyEventListener(AgentEventListener):
-    """Example event listener that prints all agent events."""
-
-    def on_agent_message_chunk(self, text: str) -> None:
-        """Called when the agent sends a message chunk."""
-        print(f"[AGENT MESSAGE] {text}", end="", flush=True)
-
-    def on_tool_call(
-        self,
-        tool_call_id: str,
-        title: str,
-        kind: Optional[str] = None,
-        status: Optional[str] = None,
-    ) -> None:
-        """Called when the agent starts a tool call."""
-        print(f"\n[TOOL CALL START] {title}")
-        print(f"  ID: {tool_call_id}")
-        print(f"  Kind: {kind}")
-        print(f"  Status: {status}")
-
-    def on_tool_response(
-        self,
-        tool_call_id: str,
-        status: Optional[str] = None,
-        content: Optional[Any] = None,
-    ) -> None:
-        """Called when a tool response is received."""
-        print(f"[TOOL RESPONSE] {tool_call_id}")
-        print(f"  Status: {status}")
-        if content:
-            print(f"  Content: {str(content)[:100]}...")  # Truncate long content
-
-    def on_agent_thought(self, text: str) -> None:
-        """Called when the agent shares its internal reasoning."""
-        print(f"[AGENT THOUGHT] {text}", end="", flush=True)
+from auggie_sdk.acp import AuggieACPClient
+import os
+import sys
+
+from _listeners import PrintingListener, send
+
+# Per-call timeout (seconds) for send_message(); override with AUGGIE_TIMEOUT
+DEFAULT_SEND_TIMEOUT = float(os.getenv("AUGGIE_TIMEOUT", "60"))
 
 
 def example_basic_usage():
@@ -71,7 +40,7 @@ def example_basic_usage():
     # Send a simple message
     message = "What is 2 + 2? Answer in one sentence."
     print(f"Sending: {message}")
-    response = client.send_message(message)
+    response = client.send_message(message, timeout=DEFAULT_SEND_TIMEOUT)
     print(f"Response: {response}\n")
 
     # Stop the agent
@@ -87,7 +56,7 @@ def example_with_listener():
     print("=" * 80)
 
     # Create client with listener
-    listener = MyEventListener()
+    listener = PrintingListener(verbose=True)
     client = AuggieACPClient(listener=listener)
 
     print("Starting agent...")
@@ -97,7 +66,7 @@ def example_with_listener():
     # Send a message that will trigger tool calls
     message = "Please read the README.md file in the current directory and summarize it in one sentence."
     print(f"Sending: {message}\n")
-    response = client.send_message(message, timeout=30.0)
+    response = send(client, listener, message, timeout=DEFAULT_SEND_TIMEOUT)
     print(f"\n\nFinal Response: {response}\n")
 
     client.stop()
@@ -110,7 +79,7 @@ def example_context_manager():
     print("EXAMPLE 3: Context Manager")
     print("=" * 80)
 
-    listener = MyEventListener()
+    listener = PrintingListener(verbose=True)
 
     # Use context manager - automatically starts and stops
     with AuggieACPClient(listener=listener) as client:
@@ -118,7 +87,7 @@ def example_context_manager():
 
         message = "What is 10 * 5?"
         print(f"Sending: {message}\n")
-        response = client.send_message(message)
+        response = send(client, listener, message, timeout=DEFAULT_SEND_TIMEOUT)
         print(f"\n\nFinal Response: {response}\n")
 
     print("Agent automatically stopped.\n")
@@ -136,7 +105,9 @@ def example_clear_context():
     # First conversation
     print("First conversation:")
     print(f"Session ID: {client.session_id}")
-    response1 = client.send_message("Remember this number: 42")
+    response1 = client.send_message(
+        "Remember this number: 42", timeout=DEFAULT_SEND_TIMEOUT
+    )
     print(f"Response: {response1}\n")
 
     # Clear context (restarts agent with new session)
@@ -149,7 +120,9 @@ def example_clear_context():
 
     # Second conversation - agent won't remember the number
     print("Second conversation (after clearing context):")
-    response2 = client.send_message("What number did I ask you to remember?")
+    response2 = client.send_message(
+        "What number did I ask you to remember?", timeout=DEFAULT_SEND_TIMEOUT
+    )
     print(f"Response: {response2}\n")
 
     client.stop()
@@ -173,9 +146,12 @@ def example_multiple_messages():
         "What is the final result?",
     ]
 
+    # Each message refers to the previous answer, so they must be sent one
+    # after another; send_message() has no client-side request preparation
+    # worth overlapping with the previous response.
     for i, message in enumerate(messages, 1):
         print(f"Message {i}: {message}")
-        response = client.send_message(message)
+        response = client.send_message(message, timeout=DEFAULT_SEND_TIMEOUT)
         print(f"Response {i}: {response}\n")
 
     client.stop()
@@ -188,8 +164,6 @@ def example_model_and_workspace():
     print("EXAMPLE 6: Model and Workspace Configuration")
     print("=" * 80)
 
-    import os
-
     # Create client with specific model and workspace
     # Use model string directly:
     client = AuggieACPClient(
@@ -212,7 +186,7 @@ def example_model_and_workspace():
     # Send a message
     message = "What is 5 * 7? Answer with just the number."
     print(f"Sending: {message}")
-    response = client.send_message(message)
+    response = client.send_message(message, timeout=DEFAULT_SEND_TIMEOUT)
     print(f"Response: {response}\n")
 
     # Stop the agent
@@ -220,29 +194,38 @@ def example_model_and_workspace():
     print("Agent stopped.\n")
 
 
+def wait_for_user():
+    """Pause between examples, but only when a user is at the terminal.
+
+    Set AUGGIE_NONINTERACTIVE to skip the pause, e.g. in CI.
+    """
+    if (
+        sys.stdin.isatty()
+        and sys.stdout.isatty()
+        and not os.getenv("AUGGIE_NONINTERACTIVE")
+    ):
+        input("Press Enter to continue to next example...")
+
+
 def main():
     """Run all examples."""
     print("\n" + "=" * 80)
     print("AUGGIE ACP CLIENT - EXAMPLES")
     print("=" * 80 + "\n")
 
-    # Run examples
-    example_basic_usage()
-    input("Press Enter to continue to next example...")
-
-    example_with_listener()
-    input("Press Enter to continue to next example...")
-
-    example_context_manager()
-    input("Press Enter to continue to next example...")
-
-    example_clear_context()
-    input("Press Enter to continue to next example...")
-
-    example_multiple_messages()
-    input("Press Enter to continue to next example...")
+    examples = [
+        example_basic_usage,
+        example_with_listener,
+        example_context_manager,
+        example_clear_context,
+        example_multiple_messages,
+        example_model_and_workspace,
+    ]
 
-    example_model_and_workspace()
+    for idx, example in enumerate(examples):
+        if idx:
+            wait_for_user()
+        example()
 
     print("\n" + "=" * 80)
     print("ALL EXAMPLES COMPLETED")
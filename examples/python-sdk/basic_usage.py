@@ -1,20 +1,21 @@
 #!/usr/bin/env python3
 """
 Basic usage examples for the Augment Python SDK.
+
+Requires the SDK to be installed (pip install auggie-sdk).
 """
 
-import sys
-from pathlib import Path
+import os
 from dataclasses import dataclass
 from enum import Enum
 
-# Add the parent directory to the path so we can import auggie_sdk
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from auggie_sdk import Auggie
 
+# Default timeout (seconds) for each agent.run() call; override with AUGGIE_TIMEOUT
+DEFAULT_RUN_TIMEOUT = int(os.getenv("AUGGIE_TIMEOUT", "180"))
+
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     title: str
     priority: str
@@ -32,7 +33,7 @@ def main():
 
     # Create an agent with custom model
     # Supported models: "haiku4.5", "sonnet4.5", "sonnet4", "gpt5"
-    agent = Auggie(model="sonnet4.5")
+    agent = Auggie(model="sonnet4.5", timeout=DEFAULT_RUN_TIMEOUT)
 
     print("🤖 Basic Agent Usage Examples")
     print("=" * 40)
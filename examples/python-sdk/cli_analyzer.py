@@ -11,13 +11,43 @@ It generates reports and conditional recommendations based on the findings.
 """
 
 from auggie_sdk import Auggie
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, fields, replace
+from enum import IntEnum
+from operator import attrgetter
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple, Union
 from pathlib import Path
+import asyncio
+import hashlib
+import heapq
+import json
+import os
 import sys
 
 
-@dataclass
+# Maximum number of files analyzed at the same time in Stage 2
+MAX_CONCURRENT_ANALYSES = 8
+
+# Default timeout (seconds) for each agent.run() call; override with AUGGIE_TIMEOUT.
+# Bounds how long a single stuck analysis can hold up the whole Stage 2 gather.
+DEFAULT_RUN_TIMEOUT = int(os.getenv("AUGGIE_TIMEOUT", "180"))
+
+# Analyses keyed by model and SHA-256 of the file contents, reused across runs
+# so unchanged (or byte-identical) files are not sent to the agent again
+ANALYSIS_CACHE_PATH = Path.home() / ".cache" / "auggie" / "file_analysis.json"
+# Part of every cache key; bump it when ANALYSIS_PROMPT or FileAnalysis changes
+# so analyses produced for the old prompt or schema are not reused
+ANALYSIS_CACHE_VERSION = 1
+
+
+class Severity(IntEnum):
+    """Issue severity; lower values are more urgent."""
+    CRITICAL = 0
+    HIGH = 1
+    MEDIUM = 2
+    LOW = 3
+
+
+@dataclass(slots=True)
 class FileAnalysis:
     """Analysis results for a single TypeScript file."""
     file_path: str
@@ -28,34 +58,234 @@ class FileAnalysis:
     importance_score: int  # 1-10, higher = more important
 
 
-@dataclass
+@dataclass(slots=True)
 class Issue:
     """Represents a code issue found during analysis."""
     file_path: str
-    severity: str  # "critical", "high", "medium", "low"
+    severity: Severity
     category: str  # "error_handling", "documentation", "bug", "code_smell"
     description: str
     line_number: Optional[int] = None
 
 
+# (missing attribute, severity, category, description) for checks that yield
+# one issue per file when the attribute is False
+MISSING_CHECK_ISSUES = (
+    ("has_error_handling", Severity.HIGH, "error_handling", "Missing proper error handling"),
+    ("has_jsdoc", Severity.MEDIUM, "documentation", "Missing JSDoc comments for exported functions"),
+)
+
+
+def issues_from_analysis(file_path: str, analysis: FileAnalysis) -> List[Issue]:
+    """Convert a single file analysis into the list of issues it implies."""
+    issues = [
+        Issue(file_path, severity, category, description)
+        for attr, severity, category, description in MISSING_CHECK_ISSUES
+        if not getattr(analysis, attr)
+    ]
+    issues.extend(Issue(file_path, Severity.CRITICAL, "bug", bug) for bug in analysis.bugs_found)
+    issues.extend(Issue(file_path, Severity.LOW, "code_smell", smell) for smell in analysis.code_smells)
+    return issues
+
+
+ANALYSIS_PROMPT = (
+    "Analyze the file {file_path}. Check for:\n"
+    "1. Whether it has proper error handling (try-catch blocks, error returns)\n"
+    "2. Whether exported functions have JSDoc comments\n"
+    "3. Any potential bugs or code smells\n"
+    "Also rate the importance of this file from 1-10 based on its role.\n"
+    "Return a FileAnalysis object."
+)
+
+
+_ANALYSIS_FIELDS = tuple(f.name for f in fields(FileAnalysis))
+
+
+def _content_digest(path: Path) -> Optional[str]:
+    """Return the SHA-256 of a file's contents, or None if it cannot be read."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _analysis_cache_key(model: str, digest: str) -> str:
+    """Cache key for a file's analysis: prompt version, model and content digest."""
+    return f"v{ANALYSIS_CACHE_VERSION}:{model}:{digest}"
+
+
+def load_analysis_cache() -> Dict[str, FileAnalysis]:
+    """Load cached analyses keyed by _analysis_cache_key (empty if none or unreadable)."""
+    try:
+        data = json.loads(ANALYSIS_CACHE_PATH.read_text())
+        return {key: FileAnalysis(**values) for key, values in data.items()}
+    except (OSError, ValueError, TypeError):
+        return {}
+
+
+def save_analysis_cache(cache: Dict[str, FileAnalysis]) -> None:
+    """Persist cached analyses so later runs can skip unchanged files."""
+    try:
+        ANALYSIS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        # Shallow per-field dicts: asdict() would deep-copy every list first
+        ANALYSIS_CACHE_PATH.write_text(
+            json.dumps(
+                {
+                    key: {name: getattr(a, name) for name in _ANALYSIS_FIELDS}
+                    for key, a in cache.items()
+                },
+                separators=(",", ":"),
+            )
+        )
+    except OSError as e:
+        print(f"   ⚠️  Could not save analysis cache: {e}")
+
+
+async def _analyze_all(
+    ts_files: List[str],
+    workspace_root: str,
+    model: str,
+    cache: Dict[str, FileAnalysis],
+) -> AsyncIterator[Tuple[str, Union[FileAnalysis, Exception]]]:
+    """
+    Analyze all files concurrently, at most MAX_CONCURRENT_ANALYSES at a time.
+
+    Each analysis is dominated by the LLM round-trip, so the blocking
+    agent.run() calls are moved to worker threads. An Auggie instance drives
+    a single CLI process and cannot be shared between threads, so every
+    worker slot owns its own agent; the pool of agents doubles as the
+    concurrency bound.
+
+    Files are grouped by content digest: byte-identical files share a single
+    analysis, and contents already analyzed by the same model and prompt
+    version (see _analysis_cache_key) are not sent to the agent at all. New
+    successful analyses are added to ``cache``.
+
+    Yields (file_path, result) pairs as soon as each analysis finishes, where
+    result is the FileAnalysis or the exception raised while analyzing it.
+    A new file is only started once a worker is free, so at most
+    MAX_CONCURRENT_ANALYSES analyses are in flight.
+    """
+    total = len(ts_files)
+    results: asyncio.Queue = asyncio.Queue()
+    running: Set[asyncio.Task] = set()
+
+    # Unreadable files get a per-path key so they are analyzed (uncached) alone
+    groups: Dict[str, List[str]] = {}
+    for file_path in ts_files:
+        digest = _content_digest(Path(workspace_root, file_path))
+        key = _analysis_cache_key(model, digest) if digest else f"path:{file_path}"
+        groups.setdefault(key, []).append(file_path)
+
+    pending: List[Tuple[str, List[str]]] = []
+    for key, file_paths in groups.items():
+        cached = cache.get(key)
+        if cached is None:
+            pending.append((key, file_paths))
+            continue
+        for file_path in file_paths:
+            print(f"   Reusing cached analysis for {file_path}")
+            results.put_nowait((file_path, replace(cached, file_path=file_path)))
+
+    pool: asyncio.Queue = asyncio.Queue()
+    for _ in range(min(MAX_CONCURRENT_ANALYSES, len(pending))):
+        pool.put_nowait(
+            Auggie(workspace_root=workspace_root, model=model, timeout=DEFAULT_RUN_TIMEOUT)
+        )
+
+    async def _analyze_one(key: str, file_paths: List[str], worker: Auggie) -> None:
+        try:
+            result = await asyncio.to_thread(
+                worker.run,
+                ANALYSIS_PROMPT.format(file_path=file_paths[0]),
+                return_type=FileAnalysis,
+            )
+        except Exception as e:
+            for file_path in file_paths:
+                results.put_nowait((file_path, e))
+            return
+        finally:
+            pool.put_nowait(worker)
+        if not key.startswith("path:"):
+            cache[key] = result
+        for file_path in file_paths:
+            results.put_nowait((file_path, replace(result, file_path=file_path)))
+
+    # Progress is only printed from the event loop thread (never from the
+    # worker threads), so lines cannot interleave
+    progress = f"   [{{}}/{len(pending)}] Analyzing {{}}{{}}..."
+
+    async def _produce() -> None:
+        for idx, (key, file_paths) in enumerate(pending, 1):
+            worker = await pool.get()
+            duplicates = len(file_paths) - 1
+            suffix = f" (+{duplicates} identical)" if duplicates else ""
+            print(progress.format(idx, file_paths[0], suffix))
+            task = asyncio.create_task(_analyze_one(key, file_paths, worker))
+            running.add(task)
+            task.add_done_callback(running.discard)
+
+    producer = asyncio.create_task(_produce())
+    try:
+        for _ in range(total):
+            yield await results.get()
+    finally:
+        producer.cancel()
+        for task in list(running):
+            task.cancel()
+        while not pool.empty():
+            pool.get_nowait().close()
+
+
+async def _run_all(prompts: List[str], workspace_root: str, model: str) -> List[Any]:
+    """
+    Run independent prompts concurrently, each on its own agent.
+
+    Returns one entry per prompt, in order: the agent's result or the
+    exception raised while running it.
+    """
+    agents = [
+        Auggie(workspace_root=workspace_root, model=model, timeout=DEFAULT_RUN_TIMEOUT)
+        for _ in prompts
+    ]
+    try:
+        return await asyncio.gather(
+            *(asyncio.to_thread(agent.run, prompt) for agent, prompt in zip(agents, prompts)),
+            return_exceptions=True,
+        )
+    finally:
+        for agent in agents:
+            agent.close()
+
+
 def main():
     """Main execution function."""
     
     # Initialize the agent
     print("🚀 Initializing Augment Agent...")
-    import os
+    workspace_root = os.getcwd()  # Use current working directory
+    model = "sonnet4.5"
     agent = Auggie(
-        workspace_root=os.getcwd(),  # Use current working directory
-        model="sonnet4.5"
+        workspace_root=workspace_root, model=model, timeout=DEFAULT_RUN_TIMEOUT
     )
+
+    # Keep one session open across all stages so every prompt builds on the
+    # conversation so far instead of starting from an empty context.
+    with agent.session() as session:
+        return run_analysis(session, workspace_root, model)
+
+
+def run_analysis(session: Auggie, workspace_root: str, model: str) -> int:
+    """Run all analysis stages inside a single agent session."""
     
     # ============================================================================
     # STAGE 1: Discover TypeScript files in the CLI directory
     # ============================================================================
     print("\n📁 Stage 1: Discovering TypeScript files...")
+    print(f"   Session: {session.session_id}")
     
     try:
-        ts_files = agent.run(
+        ts_files = session.run(
             "List all TypeScript files (.ts) in the clients/beachhead/src/cli directory. "
             "Return just the file paths as a list of strings, relative to the workspace root.",
             return_type=list[str]
@@ -77,60 +307,25 @@ def main():
     all_analyses: List[FileAnalysis] = []
     all_issues: List[Issue] = []
     
-    # Use a session to maintain context across file analyses
-    with agent.session() as session:
-        for idx, file_path in enumerate(ts_files, 1):
-            print(f"   [{idx}/{len(ts_files)}] Analyzing {file_path}...")
-            
-            try:
-                # Analyze this specific file
-                analysis = session.run(
-                    f"Analyze the file {file_path}. Check for:\n"
-                    f"1. Whether it has proper error handling (try-catch blocks, error returns)\n"
-                    f"2. Whether exported functions have JSDoc comments\n"
-                    f"3. Any potential bugs or code smells\n"
-                    f"Also rate the importance of this file from 1-10 based on its role.\n"
-                    f"Return a FileAnalysis object.",
-                    return_type=FileAnalysis
-                )
-                all_analyses.append(analysis)
-                
-                # Convert analysis to issues
-                if not analysis.has_error_handling:
-                    all_issues.append(Issue(
-                        file_path=file_path,
-                        severity="high",
-                        category="error_handling",
-                        description="Missing proper error handling"
-                    ))
-                
-                if not analysis.has_jsdoc:
-                    all_issues.append(Issue(
-                        file_path=file_path,
-                        severity="medium",
-                        category="documentation",
-                        description="Missing JSDoc comments for exported functions"
-                    ))
-                
-                for bug in analysis.bugs_found:
-                    all_issues.append(Issue(
-                        file_path=file_path,
-                        severity="critical",
-                        category="bug",
-                        description=bug
-                    ))
-                
-                for smell in analysis.code_smells:
-                    all_issues.append(Issue(
-                        file_path=file_path,
-                        severity="low",
-                        category="code_smell",
-                        description=smell
-                    ))
-                    
-            except Exception as e:
-                print(f"      ⚠️  Error analyzing {file_path}: {e}")
+    analysis_cache = load_analysis_cache()
+
+    async def _collect() -> None:
+        # Consume analyses as they complete so progress and issues show up
+        # while the remaining files are still being analyzed
+        async for file_path, analysis in _analyze_all(
+            ts_files, workspace_root, model, analysis_cache
+        ):
+            if isinstance(analysis, Exception):
+                print(f"      ⚠️  Error analyzing {file_path}: {analysis}")
                 continue
+
+            all_analyses.append(analysis)
+            file_issues = issues_from_analysis(file_path, analysis)
+            all_issues.extend(file_issues)
+            print(f"      ✓ {file_path}: {len(file_issues)} issues")
+
+    asyncio.run(_collect())
+    save_analysis_cache(analysis_cache)
     
     print(f"   ✅ Analysis complete: {len(all_issues)} issues found")
     
@@ -138,31 +333,64 @@ def main():
     # STAGE 3: Create summary report
     # ============================================================================
     print("\n📊 Stage 3: Creating summary report...")
+    print(f"   Session: {session.session_id}")
     
-    files_missing_error_handling = sum(1 for a in all_analyses if not a.has_error_handling)
-    files_missing_jsdoc = sum(1 for a in all_analyses if not a.has_jsdoc)
+    # Count both gaps and collect the files needing JSDoc (used in Stage 4)
+    # in a single pass over the analyses
+    files_missing_error_handling = 0
+    files_needing_jsdoc: List[FileAnalysis] = []
+    for a in all_analyses:
+        if not a.has_error_handling:
+            files_missing_error_handling += 1
+        if not a.has_jsdoc:
+            files_needing_jsdoc.append(a)
+    files_missing_jsdoc = len(files_needing_jsdoc)
     
     print(f"   - Files missing error handling: {files_missing_error_handling}")
     print(f"   - Files missing JSDoc: {files_missing_jsdoc}")
     
-    try:
-        agent.run(
-            f"Create a comprehensive analysis report in cli_analysis_report.md with:\n"
-            f"- Summary statistics: {len(ts_files)} files analyzed, {len(all_issues)} issues found\n"
-            f"- {files_missing_error_handling} files missing error handling\n"
-            f"- {files_missing_jsdoc} files missing JSDoc comments\n"
-            f"- Breakdown by severity and category\n"
-            f"- List of all files analyzed with their status\n"
-            f"Use the analysis data from our previous conversation in this session."
+    if not all_issues:
+        # Nothing to break down, so write the report locally instead of
+        # spending an agent round-trip on it
+        files_list = "".join(f"- {a.file_path}: no issues\n" for a in all_analyses)
+        try:
+            Path(workspace_root, "cli_analysis_report.md").write_text(
+                f"# CLI Analysis Report\n\n"
+                f"{len(ts_files)} files analyzed, 0 issues found.\n\n"
+                f"{files_list}"
+            )
+            print("   ✅ Report created: cli_analysis_report.md (no issues found)")
+        except OSError as e:
+            print(f"   ❌ Error creating report: {e}")
+    else:
+        # Stage 2 ran on separate worker agents, so share its results with the
+        # session here; later stages refer back to them.
+        analysis_summary = "\n".join(
+            f"- {a.file_path}: error handling={'yes' if a.has_error_handling else 'no'}, "
+            f"JSDoc={'yes' if a.has_jsdoc else 'no'}, importance={a.importance_score}, "
+            f"bugs={a.bugs_found}, code smells={a.code_smells}"
+            for a in all_analyses
         )
-        print("   ✅ Report created: cli_analysis_report.md")
-    except Exception as e:
-        print(f"   ❌ Error creating report: {e}")
+
+        try:
+            session.run(
+                f"Create a comprehensive analysis report in cli_analysis_report.md with:\n"
+                f"- Summary statistics: {len(ts_files)} files analyzed, {len(all_issues)} issues found\n"
+                f"- {files_missing_error_handling} files missing error handling\n"
+                f"- {files_missing_jsdoc} files missing JSDoc comments\n"
+                f"- Breakdown by severity and category\n"
+                f"- List of all files analyzed with their status\n"
+                f"Use the following per-file analysis data:\n{analysis_summary}"
+            )
+            print("   ✅ Report created: cli_analysis_report.md")
+        except Exception as e:
+            print(f"   ❌ Error creating report: {e}")
     
     # ============================================================================
     # STAGE 4: Conditional actions based on thresholds
     # ============================================================================
     print("\n⚙️  Stage 4: Checking thresholds for conditional actions...")
+    print(f"   Session: {session.session_id}")
     
     # Condition 1: More than 5 files missing error handling
     if files_missing_error_handling > 5:
@@ -170,7 +398,7 @@ def main():
         print("      Creating detailed error handling plan...")
         
         try:
-            agent.run(
+            session.run(
                 f"Create a detailed plan for adding error handling to the {files_missing_error_handling} "
                 f"files that are missing it. Save this plan in error_handling_plan.md. "
                 f"Include:\n"
@@ -192,19 +420,17 @@ def main():
         print("      Generating JSDoc templates for top 5 most important files...")
         
         # Find the 5 most important files missing JSDoc
-        files_needing_jsdoc = [a for a in all_analyses if not a.has_jsdoc]
         top_5_files = sorted(files_needing_jsdoc, key=lambda x: x.importance_score, reverse=True)[:5]
         
         print(f"      Top 5 files: {[f.file_path for f in top_5_files]}")
         
         try:
-            with agent.session() as session:
-                for file_analysis in top_5_files:
-                    session.run(
-                        f"Generate JSDoc comment templates for all exported functions in "
-                        f"{file_analysis.file_path}. Add these as comments in the file, "
-                        f"following TypeScript JSDoc best practices."
-                    )
+            for file_analysis in top_5_files:
+                session.run(
+                    f"Generate JSDoc comment templates for all exported functions in "
+                    f"{file_analysis.file_path}. Add these as comments in the file, "
+                    f"following TypeScript JSDoc best practices."
+                )
             print("      ✅ JSDoc templates generated for top 5 files")
         except Exception as e:
             print(f"      ❌ Error generating JSDoc templates: {e}")
@@ -215,14 +441,14 @@ def main():
     # STAGE 5: Prioritize and fix top 3 critical issues
     # ============================================================================
     print("\n🎯 Stage 5: Prioritizing and fixing top issues...")
+    print(f"   Session: {session.session_id}")
     
     print(f"   Total issues found: {len(all_issues)}")
     
     # Prioritize issues (critical > high > medium > low)
-    severity_order = {"critical": 0, "high": 1, "medium": 2, "low": 3}
-    sorted_issues = sorted(all_issues, key=lambda x: severity_order.get(x.severity, 4))
-    
-    top_3_issues = sorted_issues[:3]
+    # Only the top 3 are needed, so select them without sorting the full list
+    # (nsmallest keeps the original order among equal severities, like sorted)
+    top_3_issues = heapq.nsmallest(3, all_issues, key=attrgetter("severity"))
     
     if not top_3_issues:
         print("   ✅ No critical issues found!")
@@ -230,30 +456,33 @@ def main():
     
     print(f"   Top 3 critical issues:")
     for idx, issue in enumerate(top_3_issues, 1):
-        print(f"      {idx}. [{issue.severity.upper()}] {issue.file_path}: {issue.description}")
+        print(f"      {idx}. [{issue.severity.name}] {issue.file_path}: {issue.description}")
     
     # Generate specific fixes for each top issue
     print("\n   Generating fix suggestions with code examples...")
     
-    with agent.session() as session:
-        for idx, issue in enumerate(top_3_issues, 1):
-            print(f"      [{idx}/3] Creating fix for: {issue.description} in {issue.file_path}")
+    # The suggestions are independent and go to separate files, so generate
+    # them concurrently, each on its own short-lived agent
+    fix_prompts = []
+    for idx, issue in enumerate(top_3_issues, 1):
+        print(f"      [{idx}/3] Creating fix for: {issue.description} in {issue.file_path}")
+        fix_prompts.append(
+            f"Create a specific fix suggestion for this issue:\n"
+            f"File: {issue.file_path}\n"
+            f"Issue: {issue.description}\n"
+            f"Category: {issue.category}\n"
+            f"Severity: {issue.severity.name.lower()}\n\n"
+            f"Provide:\n"
+            f"1. Explanation of the problem\n"
+            f"2. Concrete code example showing the fix\n"
+            f"3. Why this fix is important\n\n"
+            f"Add this to a file called fix_suggestion_{idx}.md"
+        )
 
-            try:
-                session.run(
-                    f"Create a specific fix suggestion for this issue:\n"
-                    f"File: {issue.file_path}\n"
-                    f"Issue: {issue.description}\n"
-                    f"Category: {issue.category}\n"
-                    f"Severity: {issue.severity}\n\n"
-                    f"Provide:\n"
-                    f"1. Explanation of the problem\n"
-                    f"2. Concrete code example showing the fix\n"
-                    f"3. Why this fix is important\n\n"
-                    f"Add this to a file called fix_suggestion_{idx}.md"
-                )
-            except Exception as e:
-                print(f"         ⚠️  Error creating fix suggestion: {e}")
+    fix_results = asyncio.run(_run_all(fix_prompts, workspace_root, model))
+    for idx, result in enumerate(fix_results, 1):
+        if isinstance(result, Exception):
+            print(f"         ⚠️  Error creating fix suggestion {idx}: {result}")
     
     print("   ✅ Fix suggestions created: fix_suggestion_1.md, fix_suggestion_2.md, fix_suggestion_3.md")
     
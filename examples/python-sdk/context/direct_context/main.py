@@ -11,25 +11,65 @@ This sample demonstrates:
 - Importing state from a file
 """
 
+import functools
 import json
+import os
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator
 
-from auggie_sdk.context import DirectContext, File
+from auggie_sdk.context import DirectContext, DirectContextState, File
 
 # Sample files are in the samples/ subdirectory
 SAMPLES_DIR = Path(__file__).parent / "samples"
 
 
+def _iter_sample_paths(root: Path) -> Iterator[str]:
+    """Yield the paths of all .py files under root.
+
+    Walks the tree with os.scandir, whose directory entries already carry the
+    file type, so no extra stat call is needed per file.
+    """
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".py") and entry.is_file():
+                    yield entry.path
+
+
+def _read_file(path: str) -> str:
+    """Read a file as UTF-8 with a single read() call (unlike read_text())."""
+    with open(path, "rb") as f:
+        return f.read().decode("utf-8")
+
+
 def load_sample_files() -> list[File]:
-    """Load sample Python files from the samples directory."""
-    files = []
-    for file_path in SAMPLES_DIR.rglob("*.py"):
-        relative_path = file_path.relative_to(SAMPLES_DIR)
-        contents = file_path.read_text()
-        files.append(File(path=str(relative_path), contents=contents))
-    return files
+    """Load sample Python files from the samples directory.
+
+    Results are memoized on each file's path and mtime, so repeated loads of
+    an unchanged tree skip reading the files again.
+    """
+    fingerprint = tuple(
+        sorted((path, os.stat(path).st_mtime_ns) for path in _iter_sample_paths(SAMPLES_DIR))
+    )
+    return list(_load_sample_files_cached(fingerprint))
+
+
+@functools.lru_cache(maxsize=1)
+def _load_sample_files_cached(fingerprint: tuple[tuple[str, int], ...]) -> tuple[File, ...]:
+    paths = [path for path, _ in fingerprint]
+    # Reads are I/O-bound, so overlap them in a thread pool; map() keeps order
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        contents = list(executor.map(_read_file, paths))
+    return tuple(
+        File(path=os.path.relpath(path, SAMPLES_DIR), contents=text)
+        for path, text in zip(paths, contents)
+    )
 
 
 def main():
@@ -52,51 +92,61 @@ def main():
     print(f"  Already uploaded: {result.already_uploaded}")
 
     # Search the codebase - returns formatted string ready for LLM use or display
-    # Using queries that work well with our realistic content
+    # Using queries that work well with our realistic content. The searches are
+    # independent network calls, so run them concurrently and print in order.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        results1, results2, http_results = executor.map(
+            context.search,
+            [
+                "string utility functions for text formatting",
+                "user management service with CRUD operations",
+                "HTTP client for making API requests",
+            ],
+        )
+
     print("\n--- Search 1: Find string utility functions ---")
-    results1 = context.search("string utility functions for text formatting")
     print("Search results:")
     print(results1)
 
     print("\n--- Search 2: Find user management service ---")
-    results2 = context.search("user management service with CRUD operations")
     print("Search results:")
     print(results2)
 
     print("\n--- Search 3: Find HTTP client for API requests ---")
-    http_results = context.search("HTTP client for making API requests")
     print("Search results:")
     print(http_results)
 
+    # The three search_and_ask questions below are independent, so they run
+    # concurrently; each keeps its own retrieval query, so every answer only
+    # sees the context relevant to its question
+    question = "How does the UserService class handle user creation and validation?"
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        answer, documentation, explanation = executor.map(
+            context.search_and_ask,
+            [
+                "user creation and validation in UserService",
+                "string utility functions",
+                "utility functions",
+            ],
+            [
+                question,
+                "Generate API documentation in markdown format for the string utility functions",
+                "Explain what these utility functions do and when they would be useful",
+            ],
+        )
+
     # Use search_and_ask to ask questions about the indexed code
     print("\n--- search_and_ask Example 1: Ask questions about the code ---")
-    question = "How does the UserService class handle user creation and validation?"
     print(f"Question: {question}")
-
-    answer = context.search_and_ask(
-        "user creation and validation in UserService",
-        question,
-    )
-
     print(f"\nAnswer: {answer}")
 
     # Use search_and_ask to generate documentation
     print("\n--- search_and_ask Example 2: Generate documentation ---")
-    documentation = context.search_and_ask(
-        "string utility functions",
-        "Generate API documentation in markdown format for the string utility functions",
-    )
-
     print("\nGenerated Documentation:")
     print(documentation)
 
     # Use search_and_ask to explain code patterns
     print("\n--- search_and_ask Example 3: Explain code patterns ---")
-    explanation = context.search_and_ask(
-        "utility functions",
-        "Explain what these utility functions do and when they would be useful",
-    )
-
     print(f"\nExplanation: {explanation}")
 
     # Export state to a file
@@ -105,15 +155,17 @@ def main():
     context.export_to_file(state_file)
     print("State exported successfully")
 
-    # Show the exported state
-    with open(state_file, "r") as f:
-        exported_state = json.load(f)
+    # Read the state file once; the parsed dict is both shown and imported
+    exported_state = json.loads(state_file.read_bytes())
     print("\nExported state:")
     print(json.dumps(exported_state, indent=2))
 
-    # Import state in a new context
+    # Import state in a new context (equivalent to
+    # DirectContext.import_from_file(state_file), without parsing it again)
     print("\n--- Testing state import ---")
-    context2 = DirectContext.import_from_file(state_file, debug=False)
+    context2 = DirectContext.import_state(
+        DirectContextState.from_dict(exported_state), debug=False
+    )
     print("State imported successfully")
 
     # Verify we can still search
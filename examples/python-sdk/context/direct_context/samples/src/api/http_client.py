@@ -3,10 +3,14 @@ HTTP client for making API requests with error handling and retries
 """
 
 from dataclasses import dataclass
-from typing import Any, Dict, Literal, Optional, TypeVar, Generic
+from typing import Any, Dict, List, Literal, Optional, Tuple, TypeVar, Generic
+from urllib.parse import urlsplit
+import asyncio
+import http.client
 import json
-import urllib.request
-import urllib.error
+import threading
+
+DEFAULT_TIMEOUT = 30  # seconds
 
 
 @dataclass
@@ -34,6 +38,17 @@ class HttpClient:
     def __init__(self, base_url: str, default_headers: Optional[Dict[str, str]] = None):
         self.base_url = base_url.rstrip("/")
         self.default_headers = default_headers or {}
+        # Idle keep-alive connections per (scheme, host), reused across requests
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._idle_lock = threading.Lock()
+
+    def close(self) -> None:
+        """Close all idle pooled connections"""
+        with self._idle_lock:
+            for connections in self._idle.values():
+                for conn in connections:
+                    conn.close()
+            self._idle.clear()
 
     async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> ApiResponse:
         """
@@ -111,18 +126,74 @@ class HttpClient:
             **(config.headers or {}),
         }
 
-        data = json.dumps(config.body).encode() if config.body else None
-
-        req = urllib.request.Request(url, data=data, headers=headers, method=config.method)
+        data = json.dumps(config.body, separators=(",", ":")).encode() if config.body else None
 
-        try:
-            with urllib.request.urlopen(req) as response:
-                response_data = json.loads(response.read().decode())
-                return ApiResponse(
-                    data=response_data,
-                    status=response.status,
-                    headers=dict(response.headers),
-                )
-        except urllib.error.HTTPError as e:
-            raise Exception(f"HTTP {e.code}: {e.reason}")
+        # The request itself blocks, so run it off the event loop
+        return await asyncio.to_thread(
+            self._send, config.method, url, data, headers, config.timeout or DEFAULT_TIMEOUT
+        )
 
+    def _send(
+        self,
+        method: str,
+        url: str,
+        data: Optional[bytes],
+        headers: Dict[str, str],
+        timeout: float,
+    ) -> ApiResponse:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        # A pooled connection may have been closed by the server while idle,
+        # so retry once on a fresh connection if it fails before a response
+        for attempt in range(2):
+            conn = self._acquire(key, timeout)
+            try:
+                conn.request(method, path, body=data, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if attempt:
+                    raise
+                continue
+            except Exception:
+                conn.close()
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+
+            if response.status >= 400:
+                raise Exception(f"HTTP {response.status}: {response.reason}")
+            return ApiResponse(
+                data=json.loads(body),
+                status=response.status,
+                headers=dict(response.headers),
+            )
+        raise AssertionError("unreachable")
+
+    def _acquire(self, key: Tuple[str, str], timeout: float) -> http.client.HTTPConnection:
+        with self._idle_lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is None:
+            scheme, host = key
+            conn_class = (
+                http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            )
+            conn = conn_class(host, timeout=timeout)
+        else:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+        return conn
+
+    def _release(self, key: Tuple[str, str], conn: http.client.HTTPConnection) -> None:
+        with self._idle_lock:
+            self._idle.setdefault(key, []).append(conn)
@@ -5,8 +5,7 @@ User service for managing user data and authentication
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Literal, Optional
-import random
-import string
+import secrets
 
 
 @dataclass
@@ -32,6 +31,7 @@ class UserService:
 
     def __init__(self):
         self._users: Dict[str, User] = {}
+        self._email_to_id: Dict[str, str] = {}
 
     async def create_user(self, request: CreateUserRequest) -> User:
         """
@@ -53,6 +53,7 @@ class UserService:
         )
 
         self._users[user_id] = user
+        self._email_to_id[user.email] = user_id
         return user
 
     async def find_user_by_id(self, user_id: str) -> Optional[User]:
@@ -77,10 +78,8 @@ class UserService:
         Returns:
             User if found, None otherwise
         """
-        for user in self._users.values():
-            if user.email == email:
-                return user
-        return None
+        user_id = self._email_to_id.get(email)
+        return self._users.get(user_id) if user_id else None
 
     async def update_last_login(self, user_id: str) -> None:
         """
@@ -118,11 +117,14 @@ class UserService:
         Returns:
             True if user was deleted, False if not found
         """
-        if user_id in self._users:
-            del self._users[user_id]
-            return True
-        return False
+        user = self._users.pop(user_id, None)
+        if user is None:
+            return False
+        if self._email_to_id.get(user.email) == user_id:
+            del self._email_to_id[user.email]
+        return True
 
     def _generate_user_id(self) -> str:
-        return "user_" + "".join(random.choices(string.ascii_lowercase + string.digits, k=9))
+        # 9 lowercase hex characters from os.urandom in a single call
+        return "user_" + secrets.token_hex(5)[:9]
 
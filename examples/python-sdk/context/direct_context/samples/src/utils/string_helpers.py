@@ -3,13 +3,12 @@ String utility functions for text processing and formatting
 """
 
 
-def format_number(num: float, locale: str = "en-US") -> str:
+def format_number(num: float) -> str:
     """
-    Format a number with thousands separators
+    Format a number with thousands separators and two decimal places
 
     Args:
         num: Number to format
-        locale: Locale for formatting (default: 'en-US')
 
     Returns:
         Formatted number string
@@ -27,7 +26,7 @@ def is_even(num: int) -> bool:
     Returns:
         True if number is even, false otherwise
     """
-    return num % 2 == 0
+    return not num & 1
 
 
 def is_odd(num: int) -> bool:
@@ -40,7 +39,7 @@ def is_odd(num: int) -> bool:
     Returns:
         True if number is odd, false otherwise
     """
-    return num % 2 != 0
+    return bool(num & 1)
 
 
 def clamp(value: float, min_val: float, max_val: float) -> float:
@@ -55,7 +54,7 @@ def clamp(value: float, min_val: float, max_val: float) -> float:
     Returns:
         Clamped value
     """
-    return min(max(value, min_val), max_val)
+    return min_val if value < min_val else max_val if value > max_val else value
 
 
 def capitalize(s: str) -> str:
@@ -68,9 +67,7 @@ def capitalize(s: str) -> str:
     Returns:
         String with first letter capitalized
     """
-    if not s:
-        return s
-    return s[0].upper() + s[1:].lower()
+    return s.capitalize()
 
 
 def to_title_case(s: str) -> str:
@@ -83,7 +80,9 @@ def to_title_case(s: str) -> str:
     Returns:
         String in title case
     """
-    return " ".join(capitalize(word) for word in s.split(" "))
+    # str.title() would also capitalize after apostrophes ("Don'T"), so
+    # capitalize each space-separated word instead
+    return " ".join(word.capitalize() for word in s.split(" "))
 
 
 def truncate(s: str, max_length: int) -> str:
@@ -11,17 +11,27 @@ Usage:
 
 Endpoints:
     GET  /search?q=<query>  - Search for files and get AI-summarized results
+    GET  /search?q=<query>&stream=1 - Same, streamed as server-sent events
+                                      ("results" first, then "summary")
     GET  /health - Health check
+
+Add &pretty=1 (or ?pretty=1) to get indented JSON instead of compact output.
 """
 
 import json
+import os
 import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import datetime
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import TypedDict
-from urllib.parse import parse_qs, urlparse
+from typing import Iterator, TypedDict
+from urllib.parse import parse_qs
 
+from auggie_sdk import Auggie
 from auggie_sdk.context import FileSystemContext
 
 PORT = 3000
@@ -38,62 +48,231 @@ class SearchResponse(TypedDict):
     formattedResults: str
 
 
-def handle_search(query: str, context: FileSystemContext) -> SearchResponse:
+# Maximum number of distinct queries whose responses are kept in memory
+SEARCH_CACHE_SIZE = 256
+# Formatted results can be tens of KB each, so also cap the total number of
+# cached characters; least recently used entries are evicted first
+SEARCH_CACHE_MAX_CHARS = 16 * 1024 * 1024
+# The context keeps re-indexing the workspace as files change, so cached
+# responses are only reused for this long before searching again
+SEARCH_CACHE_TTL = 300  # seconds
+
+# Recent (summary, formattedResults, stored_at) entries keyed by normalized
+# query, least recently used first; stored_at is a time.monotonic() value
+_search_cache: "OrderedDict[str, tuple[str, str, float]]" = OrderedDict()
+_search_cache_chars = 0
+_search_cache_lock = threading.Lock()
+
+# Searches currently being computed, keyed by normalized query, so identical
+# concurrent requests wait for the same result instead of searching again
+_inflight: dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+# FileSystemContext and Auggie each talk to their own auggie process over one
+# stdio pipe and are not thread-safe, so every SDK call on the shared context
+# holds _context_lock and every summary holds _agent_lock. A slow summary
+# therefore never blocks retrieval for other searches.
+_context_lock = threading.Lock()
+_agent_lock = threading.Lock()
+
+# Model and per-call timeout for the summarizing agent; summaries are short,
+# so a fast model is enough
+SUMMARY_MODEL = "haiku4.5"
+SUMMARY_TIMEOUT = 60  # seconds
+
+# Searches run one at a time on the shared context, so only a bounded number
+# of requests may queue for it; extra requests wait up to SEARCH_TIMEOUT
+MAX_CONCURRENT_SEARCHES = 4 * (os.cpu_count() or 1)
+SEARCH_TIMEOUT = 120  # seconds
+_search_slots = threading.BoundedSemaphore(MAX_CONCURRENT_SEARCHES)
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize a query so trivially different spellings share a cache entry."""
+    return " ".join(query.casefold().split())
+
+
+def _cache_store(key: str, summary: str, formatted_results: str) -> None:
+    """Cache a response, evicting old entries to stay within both limits."""
+    global _search_cache_chars
+    size = len(summary) + len(formatted_results)
+    if size > SEARCH_CACHE_MAX_CHARS:
+        return
+    with _search_cache_lock:
+        previous = _search_cache.pop(key, None)
+        if previous is not None:
+            _search_cache_chars -= len(previous[0]) + len(previous[1])
+        _search_cache[key] = (summary, formatted_results, time.monotonic())
+        _search_cache_chars += size
+        while (
+            len(_search_cache) > SEARCH_CACHE_SIZE
+            or _search_cache_chars > SEARCH_CACHE_MAX_CHARS
+        ):
+            old_summary, old_results, _ = _search_cache.popitem(last=False)[1]
+            _search_cache_chars -= len(old_summary) + len(old_results)
+
+
+def _cache_lookup(key: str) -> tuple[str, str] | None:
+    """Return a cached (summary, formattedResults) pair unless it has expired."""
+    global _search_cache_chars
+    with _search_cache_lock:
+        cached = _search_cache.get(key)
+        if cached is None:
+            return None
+        summary, formatted_results, stored_at = cached
+        if time.monotonic() - stored_at > SEARCH_CACHE_TTL:
+            del _search_cache[key]
+            _search_cache_chars -= len(summary) + len(formatted_results)
+            return None
+        _search_cache.move_to_end(key)
+        return summary, formatted_results
+
+
+def summarize_results(query: str, formatted_results: str, agent: Auggie) -> str:
+    """
+    Summarize search results that were already retrieved
+
+    The results are put in the prompt directly (the same layout
+    search_and_ask() uses), so the search is not run a second time, and the
+    agent is told to answer from them alone rather than use its tools.
+
+    Args:
+        query: Search query string
+        formatted_results: Results returned by FileSystemContext.search()
+        agent: Auggie agent used to generate the summary
+    """
+    prompt = (
+        f"Relevant context:\n{formatted_results}\n\n"
+        f'Provide a concise summary of the relevant results for the query "{query}". '
+        "Focus only on the most relevant information. "
+        "Answer from the context above only; do not use any tools."
+    )
+    return agent.run(prompt, timeout=SUMMARY_TIMEOUT)
+
+
+def stream_search(
+    query: str, context: FileSystemContext, agent: Auggie
+) -> Iterator[tuple[str, dict]]:
+    """
+    Run a search, yielding (event, data) pairs as results become available
+
+    Yields a "results" event with the formatted results as soon as retrieval
+    finishes, then a "summary" event once the AI summary is ready. Repeated
+    queries (ignoring case and extra whitespace) are answered from an
+    in-memory LRU cache for up to SEARCH_CACHE_TTL seconds instead of
+    repeating the search and summary.
+
+    Args:
+        query: Search query string
+        context: FileSystemContext instance
+        agent: Auggie agent used to generate the summary
+    """
+    key = _normalize_query(query)
+    cached = _cache_lookup(key)
+    if cached is not None:
+        summary, formatted_results = cached
+        yield "results", {"query": query, "formattedResults": formatted_results}
+        yield "summary", {"query": query, "summary": summary}
+        return
+
+    # Search for relevant code - returns formatted string ready for LLM use
+    with _context_lock:
+        formatted_results = context.search(query)
+    if not formatted_results or formatted_results.strip() == "":
+        formatted_results = ""
+    yield "results", {"query": query, "formattedResults": formatted_results}
+
+    if formatted_results:
+        # Summarize the results we already have instead of searching again
+        with _agent_lock:
+            summary = summarize_results(query, formatted_results, agent)
+    else:
+        summary = "No relevant results found."
+
+    _cache_store(key, summary, formatted_results)
+    yield "summary", {"query": query, "summary": summary}
+
+
+def handle_search(
+    query: str, context: FileSystemContext, agent: Auggie
+) -> SearchResponse:
     """
     Handle search request
 
     Args:
         query: Search query string
         context: FileSystemContext instance
+        agent: Auggie agent used to generate the summary
 
     Returns:
         SearchResponse with query, summary, and formatted results
     """
-    # Search for relevant code - returns formatted string ready for LLM use
-    formatted_results = context.search(query)
+    key = _normalize_query(query)
+    with _inflight_lock:
+        future = _inflight.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = _inflight[key] = Future()
 
-    if not formatted_results or formatted_results.strip() == "":
-        return {
-            "query": query,
-            "summary": "No relevant results found.",
-            "formattedResults": "",
-        }
-
-    # Use search_and_ask to summarize the relevant results
-    summary = context.search_and_ask(
-        query,
-        f'Provide a concise summary of the relevant results for the query "{query}". '
-        "Focus only on the most relevant information.",
-    )
+    if not is_owner:
+        # An identical search is already running; share its result
+        return {**future.result(timeout=SEARCH_TIMEOUT), "query": query}
 
-    return {
-        "query": query,
-        "summary": summary,
-        "formattedResults": formatted_results,
-    }
+    try:
+        response: SearchResponse = {"query": query, "summary": "", "formattedResults": ""}
+        for _, data in stream_search(query, context, agent):
+            response.update(data)
+        future.set_result(response)
+        return response
+    except BaseException as error:
+        future.set_exception(error)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
 
 
 # --- HTTP Server ---
 
-# Global context
+# Global context and the agent that summarizes its search results
 context: FileSystemContext | None = None
+agent: Auggie | None = None
 workspace_dir: str = "."
 
 
 def initialize_context():
-    """Initialize the FileSystem Context"""
-    global context
+    """Initialize the FileSystem Context and the summarizing agent"""
+    global context, agent
     print("Initializing FileSystem Context...")
     context = FileSystemContext.create(workspace_dir, debug=False)
+    agent = Auggie(
+        workspace_root=workspace_dir, model=SUMMARY_MODEL, timeout=SUMMARY_TIMEOUT
+    )
     print("FileSystem Context initialized\n")
 
 
+def close_context():
+    """Close the FileSystem Context and the summarizing agent"""
+    if context:
+        context.close()
+    if agent:
+        agent.close()
+
+
 class RequestHandler(BaseHTTPRequestHandler):
     """HTTP request handler"""
 
+    # Keep connections open between requests; every response either sends a
+    # Content-Length or closes the connection when it is done
+    protocol_version = "HTTP/1.1"
+
+    # Indent JSON responses only when the client asks for it with ?pretty=1
+    pretty = False
+
     def do_OPTIONS(self):
         """Handle OPTIONS requests for CORS"""
         self.send_response(200)
+        self.send_header("Content-Length", "0")
         self._send_cors_headers()
         self.end_headers()
 
@@ -105,31 +284,40 @@ class RequestHandler(BaseHTTPRequestHandler):
 
     def _send_json_response(self, status: int, data: dict):
         """Send a JSON response"""
+        if self.pretty:
+            body = json.dumps(data, indent=2).encode()
+        else:
+            body = json.dumps(data, separators=(",", ":")).encode()
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
         self._send_cors_headers()
         self.end_headers()
-        self.wfile.write(json.dumps(data, indent=2).encode())
+        self.wfile.write(body)
 
     def do_GET(self):
         """Handle GET requests"""
-        parsed_url = urlparse(self.path)
-        path = parsed_url.path
-        query_params = parse_qs(parsed_url.query)
-
-        if path == "/search":
-            self._handle_search(query_params)
-        elif path == "/health":
-            self._send_json_response(
-                200,
-                {
-                    "status": "ok",
-                    "workspace": workspace_dir,
-                    "contextReady": context is not None,
-                },
-            )
-        else:
+        path, _, query_string = self.path.partition("?")
+        # Health probes usually carry no query string, so skip parsing it
+        query_params = parse_qs(query_string) if query_string else {}
+        self.pretty = query_params.get("pretty", ["0"])[0] == "1"
+
+        handler = self._ROUTES.get(path)
+        if handler is None:
             self._send_json_response(404, {"error": "Not found"})
+        else:
+            handler(self, query_params)
+
+    def _handle_health(self, query_params: dict):
+        """Handle health check endpoint"""
+        self._send_json_response(
+            200,
+            {
+                "status": "ok",
+                "workspace": workspace_dir,
+                "contextReady": context is not None,
+            },
+        )
 
     def _handle_search(self, query_params: dict):
         """Handle search endpoint"""
@@ -139,17 +327,59 @@ class RequestHandler(BaseHTTPRequestHandler):
             self._send_json_response(400, {"error": "Missing query parameter 'q'"})
             return
 
-        if context is None:
+        if context is None or agent is None:
             self._send_json_response(503, {"error": "Context not initialized yet"})
             return
 
+        if not _search_slots.acquire(timeout=SEARCH_TIMEOUT):
+            self._send_json_response(503, {"error": "Server busy, try again later"})
+            return
+
         try:
-            print(f'[{datetime.now().isoformat()}] Search request: "{query}"')
-            result = handle_search(query, context)
-            self._send_json_response(200, result)
+            if query_params.get("stream", ["0"])[0] == "1":
+                self._stream_search(query)
+                return
+
+            try:
+                print(f'[{datetime.now().isoformat()}] Search request: "{query}"')
+                result = handle_search(query, context, agent)
+                self._send_json_response(200, result)
+            except Exception as error:
+                print(f"Search error: {error}")
+                self._send_json_response(500, {"error": str(error)})
+        finally:
+            _search_slots.release()
+
+    def _stream_search(self, query: str):
+        """Send search results as server-sent events as soon as each is ready"""
+        print(f'[{datetime.now().isoformat()}] Streaming search request: "{query}"')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        # The stream has no known length, so it ends when the connection closes
+        self.send_header("Connection", "close")
+        self.close_connection = True
+        self._send_cors_headers()
+        self.end_headers()
+
+        try:
+            for event, data in stream_search(query, context, agent):
+                self._send_event(event, data)
         except Exception as error:
             print(f"Search error: {error}")
-            self._send_json_response(500, {"error": str(error)})
+            self._send_event("error", {"error": str(error)})
+
+    def _send_event(self, event: str, data: dict):
+        """Write one server-sent event and flush it to the client"""
+        payload = json.dumps(data, separators=(",", ":"))
+        self.wfile.write(f"event: {event}\ndata: {payload}\n\n".encode())
+        self.wfile.flush()
+
+    # GET handlers by request path
+    _ROUTES = {
+        "/search": _handle_search,
+        "/health": _handle_health,
+    }
 
     def log_message(self, format, *args):
         """Override to suppress default logging"""
@@ -173,7 +403,9 @@ def main():
     try:
         initialize_context()
 
-        server = HTTPServer(("", PORT), RequestHandler)
+        # Serve each request on its own thread so a slow search does not
+        # block /health or cache hits; searches still share the SDK locks
+        server = ThreadingHTTPServer(("", PORT), RequestHandler)
         print(f"✅ Server running at http://localhost:{PORT}/")
         print("\nExample requests:")
         print("  # Search with AI-summarized results")
@@ -186,16 +418,14 @@ def main():
         server.serve_forever()
     except KeyboardInterrupt:
         print("\n\nShutting down...")
-        if context:
-            context.close()
+        close_context()
         if server:
             server.server_close()
         print("Server stopped")
         sys.exit(0)
     except Exception as error:
         print(f"Failed to initialize: {error}")
-        if context:
-            context.close()
+        close_context()
         if server:
             server.server_close()
         sys.exit(1)
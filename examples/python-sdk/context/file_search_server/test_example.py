@@ -9,12 +9,11 @@ This example starts an HTTP server on port 3000 that provides:
 The test starts the server, verifies the endpoints work, then shuts it down.
 """
 
+import http.client
 import json
 import subprocess
 import sys
 import time
-import urllib.error
-import urllib.request
 from pathlib import Path
 
 PORT = 3000
@@ -22,27 +21,48 @@ BASE_URL = f"http://localhost:{PORT}"
 STARTUP_TIMEOUT = 30  # seconds to wait for server to start
 REQUEST_TIMEOUT = 60  # seconds for each request
 
+# One keep-alive connection shared by all requests in the test
+_conn = http.client.HTTPConnection("localhost", PORT)
 
-def wait_for_server(url: str, timeout: int = STARTUP_TIMEOUT) -> bool:
+
+def _get(path: str, timeout: float) -> http.client.HTTPResponse:
+    """Send a GET on the shared connection, reconnecting once if it dropped."""
+    _conn.timeout = timeout
+    if _conn.sock is not None:
+        _conn.sock.settimeout(timeout)
+    for attempt in range(2):
+        try:
+            _conn.request("GET", path)
+            return _conn.getresponse()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            _conn.close()
+            if attempt:
+                raise
+    raise AssertionError("unreachable")
+
+
+def wait_for_server(path: str, timeout: int = STARTUP_TIMEOUT) -> bool:
     """Wait for the server to be ready."""
     start_time = time.time()
     while time.time() - start_time < timeout:
         try:
-            req = urllib.request.Request(url, method="GET")
-            with urllib.request.urlopen(req, timeout=5) as response:
-                if response.status == 200:
-                    return True
-        except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError):
-            pass
+            response = _get(path, timeout=5)
+            response.read()
+            if response.status == 200:
+                return True
+        except (OSError, http.client.HTTPException):
+            _conn.close()
         time.sleep(1)
     return False
 
 
-def make_request(url: str, timeout: int = REQUEST_TIMEOUT) -> dict:
+def make_request(path: str, timeout: int = REQUEST_TIMEOUT) -> dict:
     """Make a GET request and return JSON response."""
-    req = urllib.request.Request(url, method="GET")
-    with urllib.request.urlopen(req, timeout=timeout) as response:
-        return json.loads(response.read().decode())
+    response = _get(path, timeout=timeout)
+    body = response.read()
+    if response.status != 200:
+        raise RuntimeError(f"HTTP {response.status}: {response.reason}")
+    return json.loads(body)
 
 
 def main():
@@ -68,7 +88,7 @@ def main():
     try:
         # Wait for server to be ready
         print(f"Waiting for server at {BASE_URL}/health...")
-        if not wait_for_server(f"{BASE_URL}/health"):
+        if not wait_for_server("/health"):
             stdout, stderr = server_process.communicate(timeout=5)
             print(f"❌ Server failed to start within {STARTUP_TIMEOUT}s")
             print(f"stdout: {stdout}")
@@ -79,14 +99,14 @@ def main():
 
         # Test health endpoint
         print("\nTesting /health endpoint...")
-        health = make_request(f"{BASE_URL}/health")
+        health = make_request("/health")
         assert health.get("status") == "ok", f"Expected status 'ok', got: {health}"
         assert health.get("contextReady") is True, f"Context not ready: {health}"
         print(f"✓ Health check passed: {health}")
 
         # Test search endpoint
         print("\nTesting /search endpoint...")
-        search_result = make_request(f"{BASE_URL}/search?q=python")
+        search_result = make_request("/search?q=python")
         # The search should return some result (structure may vary)
         assert isinstance(search_result, dict), f"Expected dict, got: {type(search_result)}"
         print(f"✓ Search returned result with keys: {list(search_result.keys())}")
@@ -94,6 +114,8 @@ def main():
         print("\n✅ file_search_server example passed")
 
     finally:
+        _conn.close()
+
         # Shutdown the server
         print("\nShutting down server...")
         server_process.terminate()
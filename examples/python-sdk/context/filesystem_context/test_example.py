@@ -11,8 +11,13 @@ This example runs synchronously and tests the FileSystemContext API for:
 
 import subprocess
 import sys
+import threading
 from pathlib import Path
 
+TIMEOUT = 300  # 5 minutes - multiple LLM API calls via search_and_ask
+EXIT_TIMEOUT = 10  # seconds to exit after printing the completion messages
+SENTINELS = ("=== Sample Complete ===", "MCP connection closed")
+
 
 def main():
     """Run the filesystem_context example and verify it completes successfully."""
@@ -23,33 +28,86 @@ def main():
     print("Running: python -m filesystem_context")
     print(f"Working directory: {context_dir}")
 
-    result = subprocess.run(
+    proc = subprocess.Popen(
         [sys.executable, "-m", "filesystem_context"],
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         text=True,
-        timeout=300,  # 5 minutes - multiple LLM API calls via search_and_ask
+        bufsize=1,
         cwd=str(context_dir),
     )
 
-    # Print output for debugging
-    if result.stdout:
-        print("=== stdout ===")
-        print(result.stdout)
-    if result.stderr:
+    # Drain stderr on a separate thread so a full pipe can't stall the child
+    stderr_lines: list[str] = []
+    stderr_thread = threading.Thread(
+        target=lambda: stderr_lines.extend(proc.stderr), daemon=True
+    )
+    stderr_thread.start()
+
+    # TIMEOUT is only an absolute ceiling; normally we stop reading as soon as
+    # both completion messages have been printed
+    timed_out = threading.Event()
+
+    def kill_on_timeout():
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(TIMEOUT, kill_on_timeout)
+    timer.start()
+
+    print("=== stdout ===")
+    stdout_lines: list[str] = []
+    seen: set[str] = set()
+    try:
+        for line in proc.stdout:
+            print(line, end="")
+            stdout_lines.append(line)
+            seen.update(sentinel for sentinel in SENTINELS if sentinel in line)
+            if len(seen) == len(SENTINELS):
+                break
+
+        # The sample is done; keep draining stdout so output written while it
+        # shuts down cannot fill the pipe, and give it a moment to exit
+        stdout_thread = threading.Thread(
+            target=lambda: stdout_lines.extend(proc.stdout), daemon=True
+        )
+        stdout_thread.start()
+        try:
+            returncode = proc.wait(timeout=EXIT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            proc.terminate()
+            proc.wait()
+            returncode = None
+    finally:
+        timer.cancel()
+
+    stdout_thread.join(timeout=5)
+    stderr_thread.join(timeout=5)
+    if stderr_lines:
         print("=== stderr ===")
-        print(result.stderr)
+        print("".join(stderr_lines))
+
+    stdout = "".join(stdout_lines)
+
+    if timed_out.is_set():
+        print(f"❌ Example timed out after {TIMEOUT} seconds")
+        sys.exit(1)
+
+    if returncode is None:
+        print(f"❌ Example did not exit within {EXIT_TIMEOUT} seconds after completing")
+        sys.exit(1)
 
     # Verify success
-    if result.returncode != 0:
-        print(f"❌ Example failed with exit code {result.returncode}")
+    if returncode != 0:
+        print(f"❌ Example failed with exit code {returncode}")
         sys.exit(1)
 
     # Verify expected output
-    if "=== Sample Complete ===" not in result.stdout:
+    if "=== Sample Complete ===" not in stdout:
         print("❌ Example did not complete successfully (missing completion message)")
         sys.exit(1)
 
-    if "MCP connection closed" not in result.stdout:
+    if "MCP connection closed" not in stdout:
         print("❌ Example did not properly close MCP connection")
         sys.exit(1)
 
@@ -58,4 +116,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
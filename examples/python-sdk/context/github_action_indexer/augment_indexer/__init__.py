@@ -8,17 +8,29 @@ See README.md for usage instructions.
 """
 
 from .models import FileChange, IndexConfig, IndexResult, IndexState
-from .file_filter import should_filter_file
-from .github_client import GitHubClient
-from .index_manager import IndexManager
+from .file_filter import FilterResult, should_filter_file
 
 __all__ = [
     "FileChange",
     "IndexConfig", 
     "IndexResult",
     "IndexState",
+    "FilterResult",
     "should_filter_file",
     "GitHubClient",
     "IndexManager",
 ]
 
+
+def __getattr__(name: str):
+    # GitHubClient and IndexManager pull in PyGithub, requests and pathspec,
+    # which the search command doesn't need, so import them on first use
+    if name == "GitHubClient":
+        from .github_client import GitHubClient
+
+        return GitHubClient
+    if name == "IndexManager":
+        from .index_manager import IndexManager
+
+        return IndexManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,19 +2,76 @@
 File filtering logic for GitHub repository indexing.
 """
 
-import re
-from pathlib import Path
-from typing import Optional
-
-# Keyish pattern regex - matches files that likely contain secrets/keys
-KEYISH_PATTERN = re.compile(
-    r'^(\.git|.*\.pem|.*\.key|.*\.pfx|.*\.p12|.*\.jks|.*\.keystore|.*\.pkcs12|.*\.crt|.*\.cer|id_rsa|id_ed25519|id_ecdsa|id_dsa)$'
+from typing import NamedTuple, Optional
+
+# Keyish filenames - files that likely contain secrets/keys. Checked with
+# str.endswith(tuple) and a set lookup rather than a regex alternation.
+KEYISH_SUFFIXES = (
+    ".pem",
+    ".key",
+    ".pfx",
+    ".p12",
+    ".jks",
+    ".keystore",
+    ".pkcs12",
+    ".crt",
+    ".cer",
+)
+KEYISH_NAMES = frozenset({".git", "id_rsa", "id_ed25519", "id_ecdsa", "id_dsa"})
+
+# Extensions of formats that are always binary; files with these extensions
+# are filtered without decoding their content
+BINARY_SUFFIXES = (
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".ico",
+    ".webp",
+    ".pdf",
+    ".mp3",
+    ".mp4",
+    ".mov",
+    ".woff",
+    ".woff2",
+    ".ttf",
+    ".otf",
+    ".zip",
+    ".tar",
+    ".gz",
+    ".tgz",
+    ".bz2",
+    ".xz",
+    ".7z",
+    ".jar",
+    ".wasm",
+    ".so",
+    ".dll",
+    ".dylib",
+    ".o",
+    ".a",
+    ".exe",
+    ".class",
+    ".pyc",
 )
 
 # Default max file size in bytes (1 MB)
 DEFAULT_MAX_FILE_SIZE = 1024 * 1024  # 1 MB
 
 
+class FilterResult(NamedTuple):
+    """Outcome of should_filter_path / should_filter_file."""
+
+    filtered: bool
+    """True if the file should be skipped"""
+
+    reason: Optional[str] = None
+    """Why the file is skipped (set when filtered)"""
+
+    text: Optional[str] = None
+    """The content decoded as UTF-8 (set by should_filter_file when not filtered)"""
+
+
 def always_ignore_path(path: str) -> bool:
     """
     Check if a path should always be ignored (security measure).
@@ -39,8 +96,8 @@ def is_keyish_path(path: str) -> bool:
         True if the filename matches patterns for secret/key files.
     """
     # Extract filename from path
-    filename = Path(path).name
-    return bool(KEYISH_PATTERN.match(filename))
+    filename = path.rpartition("/")[2]
+    return filename in KEYISH_NAMES or filename.endswith(KEYISH_SUFFIXES)
 
 
 def is_valid_file_size(size_bytes: int, max_file_size: int = DEFAULT_MAX_FILE_SIZE) -> bool:
@@ -67,6 +124,10 @@ def is_valid_utf8(content: bytes) -> bool:
     Returns:
         True if the content is valid UTF-8, False if it's binary or invalid.
     """
+    # Most source files are pure ASCII, which is always valid UTF-8; checking
+    # that is much cheaper than decoding the whole file into a str
+    if content.isascii():
+        return True
     try:
         content.decode("utf-8")
         return True
@@ -74,16 +135,75 @@ def is_valid_utf8(content: bytes) -> bool:
         return False
 
 
+def should_filter_path(
+    path: str,
+    size: int,
+    max_file_size: Optional[int] = None,
+) -> FilterResult:
+    """
+    Run the checks of should_filter_file that need only the path and size.
+
+    This lets a caller reject a file before reading its content.
+
+    Args:
+        path: The file path to check.
+        size: The file size in bytes.
+        max_file_size: Maximum allowed file size in bytes. Defaults to DEFAULT_MAX_FILE_SIZE.
+
+    Returns:
+        A FilterResult with filtered and, when filtered, reason set.
+    """
+    effective_max_size = max_file_size if max_file_size is not None else DEFAULT_MAX_FILE_SIZE
+
+    # 1. Check for ".." in path (security)
+    if always_ignore_path(path):
+        return FilterResult(True, "path_contains_dotdot")
+
+    # 2. Check file size
+    if not is_valid_file_size(size, effective_max_size):
+        return FilterResult(True, f"file_too_large ({size} bytes)")
+
+    # 3. Check keyish patterns (secrets/keys)
+    if is_keyish_path(path):
+        return FilterResult(True, "keyish_pattern")
+
+    return FilterResult(False)
+
+
+def decode_text(path: str, content: bytes) -> Optional[str]:
+    """
+    Decode file content as UTF-8 text (binary detection).
+
+    Validating UTF-8 is decoding, so the decoded text is returned rather
+    than a bool, and the caller does not decode the content a second time.
+
+    Args:
+        path: The file path, used to skip known binary formats.
+        content: The file content as bytes.
+
+    Returns:
+        The decoded text, or None if the file is binary.
+    """
+    # Known binary formats are rejected without decoding
+    if path.lower().endswith(BINARY_SUFFIXES):
+        return None
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+
 def should_filter_file(
     path: str,
     content: bytes,
     max_file_size: Optional[int] = None,
-) -> dict:
+) -> FilterResult:
     """
     Check if a file should be filtered out.
 
-    Returns {"filtered": True, "reason": "..."} if file should be skipped.
-    Returns {"filtered": False} if file should be included.
+    Returns FilterResult(filtered=True, reason="...") if file should be skipped.
+    Returns FilterResult(filtered=False, text="...") if file should be included,
+    where text is the content decoded as UTF-8.
 
     Priority order (from file-filtering.md):
         1. Path validation (contains "..")
@@ -99,25 +219,16 @@ def should_filter_file(
         max_file_size: Maximum allowed file size in bytes. Defaults to DEFAULT_MAX_FILE_SIZE.
 
     Returns:
-        A dict with "filtered" (bool) and optionally "reason" (str) keys.
+        A FilterResult with filtered and either reason or text set.
     """
-    effective_max_size = max_file_size if max_file_size is not None else DEFAULT_MAX_FILE_SIZE
-
-    # 1. Check for ".." in path (security)
-    if always_ignore_path(path):
-        return {"filtered": True, "reason": "path_contains_dotdot"}
-
-    # 2. Check file size
-    if not is_valid_file_size(len(content), effective_max_size):
-        return {"filtered": True, "reason": f"file_too_large ({len(content)} bytes)"}
-
-    # 3. Check keyish patterns (secrets/keys)
-    if is_keyish_path(path):
-        return {"filtered": True, "reason": "keyish_pattern"}
+    # 1-3. Path validation, file size, keyish patterns
+    result = should_filter_path(path, len(content), max_file_size)
+    if result.filtered:
+        return result
 
     # 4. Check UTF-8 validity (binary detection)
-    if not is_valid_utf8(content):
-        return {"filtered": True, "reason": "binary_file"}
-
-    return {"filtered": False}
+    text = decode_text(path, content)
+    if text is None:
+        return FilterResult(True, "binary_file")
 
+    return FilterResult(False, text=text)
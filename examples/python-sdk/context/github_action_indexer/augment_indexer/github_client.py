@@ -2,17 +2,59 @@
 GitHub API client for fetching repository data.
 """
 
-import io
+import os
 import tarfile
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import quote
 
 import pathspec
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from github import Github
+from github.Comparison import Comparison
 from github.GithubException import GithubException
+from github.Repository import Repository
 
-from .file_filter import should_filter_file
+from .file_filter import decode_text, should_filter_path
 from .models import FileChange
 
+# REST API root for github.com. GitHub Actions sets GITHUB_API_URL to the
+# right root on GitHub Enterprise Server, so that value takes precedence.
+DEFAULT_GITHUB_API_URL = "https://api.github.com"
+
+# Number of file contents downloaded concurrently by compare_commits. The
+# HTTP session's connection pool is sized to match so that every worker
+# keeps its connection alive.
+CONTENT_DOWNLOAD_WORKERS = 16
+
+# Repository-root files whose patterns exclude files from the index
+IGNORE_FILES = frozenset({".gitignore", ".augmentignore"})
+
+
+@lru_cache(maxsize=32)
+def _compile_ignore_file(content: bytes) -> pathspec.GitIgnoreSpec | None:
+    """
+    Compile the patterns of a .gitignore-style file.
+
+    GitIgnoreSpec follows git's own matching rules (e.g. for negated
+    patterns) and matches faster than a generic "gitwildmatch" PathSpec.
+    Results are cached by content, since ignore files rarely change between
+    the refs a long-lived client downloads.
+
+    Args:
+        content: The raw file content.
+
+    Returns:
+        The compiled patterns, or None if the file is not valid UTF-8.
+    """
+    try:
+        return pathspec.GitIgnoreSpec.from_lines(content.decode("utf-8").splitlines())
+    except UnicodeDecodeError:
+        return None
+
 
 class GitHubClient:
     """GitHub API client for fetching repository data."""
@@ -24,8 +66,66 @@ class GitHubClient:
         Args:
             token: GitHub personal access token or GitHub App token.
         """
-        self._github = Github(token)
+        self._api_url = os.environ.get("GITHUB_API_URL", DEFAULT_GITHUB_API_URL).rstrip("/")
+        self._github = Github(token, base_url=self._api_url)
         self._token = token
+        # Shared session for requests made without PyGithub: keeps connections
+        # alive between calls and retries transient server errors
+        self._http = requests.Session()
+        self._http.headers["Authorization"] = f"Bearer {token}"
+        self._http.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=CONTENT_DOWNLOAD_WORKERS,
+                pool_maxsize=CONTENT_DOWNLOAD_WORKERS,
+                max_retries=Retry(
+                    total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504)
+                ),
+            ),
+        )
+        # Repository objects by "owner/repo"; fetching one is an API call
+        self._repositories: dict[str, Repository] = {}
+        # Comparisons by (owner, repo, base, head); a push is typically
+        # compared by is_force_push and then again by compare_commits
+        self._comparisons: dict[tuple[str, str, str, str], Comparison] = {}
+
+    def _get_repository(self, owner: str, repo: str) -> Repository:
+        """
+        Get a repository, fetching it from the API only the first time.
+
+        Args:
+            owner: Repository owner.
+            repo: Repository name.
+
+        Returns:
+            The PyGithub Repository object.
+        """
+        full_name = f"{owner}/{repo}"
+        repository = self._repositories.get(full_name)
+        if repository is None:
+            repository = self._github.get_repo(full_name)
+            self._repositories[full_name] = repository
+        return repository
+
+    def _compare(self, owner: str, repo: str, base: str, head: str) -> Comparison:
+        """
+        Compare two commits, calling the API only the first time.
+
+        Args:
+            owner: Repository owner.
+            repo: Repository name.
+            base: Base commit SHA.
+            head: Head commit SHA.
+
+        Returns:
+            The PyGithub Comparison object.
+        """
+        key = (owner, repo, base, head)
+        comparison = self._comparisons.get(key)
+        if comparison is None:
+            comparison = self._get_repository(owner, repo).compare(base, head)
+            self._comparisons[key] = comparison
+        return comparison
 
     def resolve_ref(self, owner: str, repo: str, ref: str) -> str:
         """
@@ -43,7 +143,7 @@ class GitHubClient:
             Exception: If the ref cannot be resolved.
         """
         try:
-            repository = self._github.get_repo(f"{owner}/{repo}")
+            repository = self._get_repository(owner, repo)
             commit = repository.get_commit(ref)
             return commit.sha
         except GithubException as error:
@@ -65,83 +165,115 @@ class GitHubClient:
         """
         print(f"Downloading tarball for {owner}/{repo}@{ref}...")
 
-        repository = self._github.get_repo(f"{owner}/{repo}")
+        repository = self._get_repository(owner, repo)
         tarball_url = repository.get_archive_link("tarball", ref)
 
         # Download tarball (10 minute timeout to handle large repositories)
-        # Include auth header for private repos
-        headers = {"Authorization": f"Bearer {self._token}"}
-        response = requests.get(tarball_url, headers=headers, stream=True, timeout=600)
+        # through the shared session, which carries the auth header needed
+        # for private repos
+        response = self._http.get(tarball_url, stream=True, timeout=600)
         if not response.ok:
             raise Exception(f"Failed to download tarball: {response.reason}")
 
-        # Load ignore patterns
-        augmentignore, gitignore = self._load_ignore_patterns(owner, repo, ref)
+        # Ignore patterns are read from the tarball itself when the root
+        # .augmentignore and .gitignore stream past, rather than fetched with
+        # separate API calls. Entries that precede them (.github/, for one)
+        # are re-checked at that point.
+        augmentignore_match = None
+        gitignore_match = None
 
         # Track filtering statistics
         files: dict[str, str] = {}
         total_files = 0
         filtered_files = 0
-        filter_reasons: dict[str, int] = {}
-
-        # Extract files from tarball
-        tarball_data = io.BytesIO(response.content)
-        with tarfile.open(fileobj=tarball_data, mode="r:gz") as tar:
-            for member in tar.getmembers():
+        filter_reasons: defaultdict[str, int] = defaultdict(int)
+
+        # Extract files while the tarball downloads: the stream ("r|gz") is
+        # decompressed member by member straight off the socket instead of
+        # being buffered in memory first
+        response.raw.decode_content = True
+        with response, tarfile.open(fileobj=response.raw, mode="r|gz") as tar:
+            for member in tar:
                 # Skip directories and symlinks
-                if not member.isfile():
+                if member.type not in tarfile.REGULAR_TYPES:
                     continue
 
                 total_files += 1
 
                 # Remove the root directory prefix (e.g., "owner-repo-sha/")
-                path_parts = member.name.split("/")
-                path_parts.pop(0)  # Remove first component
-                file_path = "/".join(path_parts)
+                file_path = member.name.partition("/")[2]
 
                 if not file_path:
                     continue
 
-                # Read file contents
-                file_obj = tar.extractfile(member)
-                if file_obj is None:
-                    continue
-                content_bytes = file_obj.read()
+                content_bytes = None
+
+                if file_path in IGNORE_FILES:
+                    file_obj = tar.extractfile(member)
+                    if file_obj is None:
+                        continue
+                    content_bytes = file_obj.read()
+
+                    spec = _compile_ignore_file(content_bytes)
+                    if spec is not None:
+                        if file_path == ".augmentignore":
+                            reason = "augmentignore"
+                            augmentignore_match = spec.match_file
+                        else:
+                            reason = "gitignore"
+                            gitignore_match = spec.match_file
+
+                        # Drop files accepted before the patterns were known
+                        for earlier_path in [path for path in files if spec.match_file(path)]:
+                            del files[earlier_path]
+                            filtered_files += 1
+                            filter_reasons[reason] += 1
 
                 # Apply filtering in priority order:
-                # 1. .augmentignore
-                if augmentignore and augmentignore.match_file(file_path):
+                # 1. .augmentignore (needs only the path, so it runs before the
+                # member is read)
+                if augmentignore_match and augmentignore_match(file_path):
                     filtered_files += 1
-                    filter_reasons["augmentignore"] = filter_reasons.get("augmentignore", 0) + 1
+                    filter_reasons["augmentignore"] += 1
                     continue
 
-                # 2. Path validation, file size, keyish patterns, UTF-8 validation
-                filter_result = should_filter_file(path=file_path, content=content_bytes)
+                # 2. Path validation, file size, keyish patterns. The size comes
+                # from the tar header, so oversized files are skipped without
+                # reading (and decompressing into memory) their content.
+                filter_result = should_filter_path(file_path, member.size)
 
-                if filter_result["filtered"]:
+                if filter_result.filtered:
                     filtered_files += 1
-                    reason = filter_result.get("reason", "unknown")
-                    filter_reasons[reason] = filter_reasons.get(reason, 0) + 1
+                    filter_reasons[filter_result.reason] += 1
                     continue
 
-                # 3. .gitignore (checked last)
-                if gitignore and gitignore.match_file(file_path):
+                # Read file contents
+                if content_bytes is None:
+                    file_obj = tar.extractfile(member)
+                    if file_obj is None:
+                        continue
+                    content_bytes = file_obj.read()
+
+                # 3. UTF-8 validation (kept inline: this costs microseconds per
+                # file, less than pickling the contents to a worker process)
+                contents = decode_text(file_path, content_bytes)
+
+                if contents is None:
                     filtered_files += 1
-                    filter_reasons["gitignore"] = filter_reasons.get("gitignore", 0) + 1
+                    filter_reasons["binary_file"] += 1
                     continue
 
-                # File passed all filters
-                try:
-                    contents = content_bytes.decode("utf-8")
-                    files[file_path] = contents
-                except UnicodeDecodeError:
-                    # This should not happen if is_valid_utf8() is working correctly
+                # 4. .gitignore (checked last)
+                if gitignore_match and gitignore_match(file_path):
                     filtered_files += 1
-                    filter_reasons["decode_error"] = filter_reasons.get("decode_error", 0) + 1
-                    print(f"Warning: File {file_path} passed UTF-8 validation but failed to decode")
+                    filter_reasons["gitignore"] += 1
+                    continue
+
+                # File passed all filters
+                files[file_path] = contents
 
         print(f"Extracted {len(files)} files from tarball")
-        print(f"Filtered {filtered_files} of {total_files} files. Reasons: {filter_reasons}")
+        print(f"Filtered {filtered_files} of {total_files} files. Reasons: {dict(filter_reasons)}")
         return files
 
     def compare_commits(
@@ -152,32 +284,35 @@ class GitHubClient:
         """
         print(f"Comparing {base}...{head}...")
 
-        repository = self._github.get_repo(f"{owner}/{repo}")
-        comparison = repository.compare(base, head)
+        comparison = self._compare(owner, repo, base, head)
 
-        files: list[FileChange] = []
-
-        for file in comparison.files:
-            change = FileChange(
+        files: list[FileChange] = [
+            FileChange(
                 path=file.filename,
                 status=self._map_github_status(file.status),
                 previousFilename=file.previous_filename,
             )
-
-            # Download file contents for added/modified files
-            if change.status in ("added", "modified"):
+            for file in comparison.files
+        ]
+
+        # Download file contents for added/modified files. Each download is
+        # its own API round-trip, so they are made concurrently.
+        with ThreadPoolExecutor(max_workers=CONTENT_DOWNLOAD_WORKERS) as executor:
+            downloads = {
+                executor.submit(self.get_file_contents, owner, repo, change.path, head): change
+                for change in files
+                if change.status in ("added", "modified")
+            }
+            for future, change in downloads.items():
                 try:
-                    contents = self.get_file_contents(owner, repo, file.filename, head)
-                    change.contents = contents
+                    change.contents = future.result()
                 except Exception as error:
-                    print(f"Warning: Failed to download {file.filename}: {error}")
-
-            files.append(change)
+                    print(f"Warning: Failed to download {change.path}: {error}")
 
         return {
             "files": files,
             "commits": comparison.total_commits,
-            "totalChanges": len(comparison.files),
+            "totalChanges": len(files),
         }
 
     def get_file_contents(
@@ -195,54 +330,22 @@ class GitHubClient:
         Returns:
             The file contents as a string.
 
-        Raises:
-            Exception: If the path is not a file.
-        """
-        repository = self._github.get_repo(f"{owner}/{repo}")
-        content = repository.get_contents(path, ref)
-
-        if isinstance(content, list):
-            raise Exception(f"{path} is not a file")
-
-        return content.decoded_content.decode("utf-8")
+        The path must name a file, as the entries of a commit comparison do;
+        the raw response body is returned as is, so this is not checked here.
 
-    def _load_ignore_patterns(
-        self, owner: str, repo: str, ref: str
-    ) -> tuple[pathspec.PathSpec | None, pathspec.PathSpec | None]:
-        """
-        Load .gitignore and .augmentignore patterns separately.
-
-        Returns both filters to maintain proper priority order:
-        .augmentignore → keyish → .gitignore
-
-        Args:
-            owner: Repository owner.
-            repo: Repository name.
-            ref: Git ref to load patterns from.
-
-        Returns:
-            Tuple of (augmentignore, gitignore) PathSpec objects, or None if not found.
+        Raises:
+            Exception: If the file cannot be fetched.
         """
-        augmentignore: pathspec.PathSpec | None = None
-        gitignore: pathspec.PathSpec | None = None
-
-        # Try to load .gitignore
-        try:
-            gitignore_content = self.get_file_contents(owner, repo, ".gitignore", ref)
-            gitignore = pathspec.PathSpec.from_lines("gitwildmatch", gitignore_content.splitlines())
-        except Exception:
-            # .gitignore doesn't exist
-            pass
-
-        # Try to load .augmentignore
-        try:
-            augmentignore_content = self.get_file_contents(owner, repo, ".augmentignore", ref)
-            augmentignore = pathspec.PathSpec.from_lines("gitwildmatch", augmentignore_content.splitlines())
-        except Exception:
-            # .augmentignore doesn't exist
-            pass
-
-        return augmentignore, gitignore
+        # The raw media type returns the file body itself, rather than JSON
+        # with base64-encoded content that PyGithub would have to decode
+        response = self._http.get(
+            f"{self._api_url}/repos/{owner}/{repo}/contents/{quote(path)}",
+            params={"ref": ref},
+            headers={"Accept": "application/vnd.github.raw"},
+            timeout=30,
+        )
+        response.raise_for_status()
+        return response.content.decode("utf-8")
 
     def _map_github_status(self, status: str) -> str:
         """
@@ -277,11 +380,9 @@ class GitHubClient:
         Returns:
             True if .gitignore or .augmentignore changed, False otherwise.
         """
-        repository = self._github.get_repo(f"{owner}/{repo}")
-        comparison = repository.compare(base, head)
+        comparison = self._compare(owner, repo, base, head)
 
-        ignore_files = [".gitignore", ".augmentignore"]
-        return any(file.filename in ignore_files for file in comparison.files)
+        return any(file.filename in IGNORE_FILES for file in comparison.files)
 
     def is_force_push(
         self, owner: str, repo: str, base: str, head: str
@@ -299,8 +400,7 @@ class GitHubClient:
             True if the push was a force push, False otherwise.
         """
         try:
-            repository = self._github.get_repo(f"{owner}/{repo}")
-            repository.compare(base, head)
+            self._compare(owner, repo, base, head)
             return False
         except GithubException:
             # If comparison fails, it's likely a force push
@@ -2,19 +2,38 @@
 Index Manager - Core indexing logic
 """
 
-import json
-import tempfile
+import os
 from pathlib import Path
 from typing import Optional
 
-from auggie_sdk.context import DirectContext, File
+from auggie_sdk.context import DirectContext, DirectContextState, File
 
-from .github_client import GitHubClient
+from . import serialization
+from .github_client import IGNORE_FILES, GitHubClient
 from .models import FileChange, IndexConfig, IndexResult, IndexState, RepositoryInfo
 
 DEFAULT_MAX_COMMITS = 100
 DEFAULT_MAX_FILES = 500
 
+# Number of files uploaded per add_to_index call during a full re-index
+INDEX_BATCH_SIZE = 256
+
+# Incremental runs append a delta to "<state_path>.log" instead of rewriting the
+# whole state; after this many deltas the log is folded into a new snapshot
+MAX_STATE_DELTAS = 20
+
+def _fsync_dir(path: str) -> None:
+    """Flush a directory entry change (rename or unlink) to disk."""
+    # Directories cannot be opened for fsync on Windows; renames there are
+    # already durable enough for this example
+    if os.name != "posix":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
 
 class IndexManager:
     """Index Manager - Core indexing logic for GitHub repositories."""
@@ -33,7 +52,13 @@ class IndexManager:
         self._context = context
         self._config = config
         self._state_path = state_path
+        Path(state_path).parent.mkdir(parents=True, exist_ok=True)
         self._github = GitHubClient(config.githubToken)
+        # Number of deltas logged since the last full snapshot
+        self._state_deltas = 0
+        # Comparison fetched while deciding whether to re-index, reused by the
+        # incremental update so the commits are only compared once
+        self._comparison: Optional[dict] = None
 
     def resolve_commit_sha(self) -> None:
         """
@@ -73,11 +98,8 @@ class IndexManager:
         Returns:
             The loaded IndexState or None if the file doesn't exist.
         """
-        try:
-            with open(self._state_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return None
+        state, self._state_deltas = serialization.load_index_state(self._state_path)
+        return state
 
     def _save_state(self, state: IndexState) -> None:
         """
@@ -111,12 +133,74 @@ class IndexManager:
         Args:
             state: The IndexState to save.
         """
-        # Ensure directory exists
-        Path(self._state_path).parent.mkdir(parents=True, exist_ok=True)
+        # Compact JSON keeps large states smaller and faster to write; set
+        # AUGMENT_INDEX_DEBUG to write the snapshot indented for inspection
+        indent = bool(os.environ.get("AUGMENT_INDEX_DEBUG"))
+        data = serialization.dumps(state, indent=indent)
+
+        # Write to a temp file in the same directory and rename it over the
+        # snapshot, so a crash mid-write leaves the previous snapshot intact.
+        # The deltas the new snapshot supersedes are removed (durably) before
+        # the rename: a crash in between leaves the old snapshot without its
+        # deltas, which is merely stale, whereas replaying old deltas on top
+        # of the new snapshot would corrupt it.
+        temp_path = self._state_path + ".tmp"
+        state_dir = os.path.dirname(os.path.abspath(self._state_path))
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            log_path = Path(serialization.state_log_path(self._state_path))
+            if log_path.exists():
+                log_path.unlink()
+                _fsync_dir(state_dir)
+            os.replace(temp_path, self._state_path)
+            _fsync_dir(state_dir)
+        except BaseException:
+            Path(temp_path).unlink(missing_ok=True)
+            raise
+        self._state_deltas = 0
+
+    def _save_state_delta(
+        self, previous_state: IndexState, state: IndexState
+    ) -> None:
+        """
+        Append the difference between two states to the state log.
+
+        Only the blobs that changed are written, so an incremental run costs
+        O(changed files) instead of re-serializing the whole index. Every
+        MAX_STATE_DELTAS deltas the log is compacted into a full snapshot.
+        A custom storage backend that replaces _save_state can replace this
+        method with a call to _save_state(state).
 
-        # Write state to file
-        with open(self._state_path, "w", encoding="utf-8") as f:
-            json.dump(state, f, indent=2)
+        Args:
+            previous_state: The state the delta is relative to.
+            state: The new state to persist.
+        """
+        if self._state_deltas + 1 >= MAX_STATE_DELTAS:
+            self._save_state(state)
+            return
+
+        old_context = previous_state["contextState"]
+        new_context = state["contextState"]
+        old_blobs = {name: path for name, path in old_context["blobs"]}
+        new_blobs = {name: path for name, path in new_context["blobs"]}
+        delta = {
+            "lastCommitSha": state["lastCommitSha"],
+            "checkpointId": new_context["checkpointId"],
+            "addedBlobs": new_context["addedBlobs"],
+            "deletedBlobs": new_context["deletedBlobs"],
+            "blobsAdded": [
+                [name, path]
+                for name, path in new_blobs.items()
+                if old_blobs.get(name) != path
+            ],
+            "blobsRemoved": [name for name in old_blobs if name not in new_blobs],
+        }
+        with open(serialization.state_log_path(self._state_path), "ab") as f:
+            f.write(serialization.dumps(delta) + b"\n")
+        self._state_deltas += 1
 
     def index(self) -> IndexResult:
         """
@@ -137,6 +221,24 @@ class IndexManager:
             # If we have previous state, we'll need to create a new context with the imported state
             # For now, we'll handle this in the incremental update logic
 
+            # Same repository and commit as last time - nothing to compare,
+            # upload, export or save, so skip the GitHub calls entirely
+            if (
+                previous_state
+                and self._is_same_repository(previous_state)
+                and previous_state["lastCommitSha"] == self._config.currentCommit
+            ):
+                print("No changes detected")
+                checkpoint_id = previous_state["contextState"].get("checkpointId")
+                return IndexResult(
+                    success=True,
+                    type="no-changes",
+                    filesIndexed=0,
+                    filesDeleted=0,
+                    checkpointId=checkpoint_id or "",
+                    commitSha=self._config.currentCommit,
+                )
+
             # Determine if we need full re-index
             should_reindex, reason = self._should_full_reindex(previous_state)
 
@@ -160,6 +262,13 @@ class IndexManager:
                 error=str(error),
             )
 
+    def _is_same_repository(self, previous_state: IndexState) -> bool:
+        """Whether the previous state was indexed from the configured repository."""
+        return (
+            previous_state["repository"]["owner"] == self._config.owner
+            and previous_state["repository"]["name"] == self._config.repo
+        )
+
     def _should_full_reindex(
         self, previous_state: Optional[IndexState]
     ) -> tuple[bool, Optional[str]]:
@@ -177,17 +286,9 @@ class IndexManager:
             return (True, "first_run")
 
         # Different repository
-        if (
-            previous_state["repository"]["owner"] != self._config.owner
-            or previous_state["repository"]["name"] != self._config.repo
-        ):
+        if not self._is_same_repository(previous_state):
             return (True, "different_repository")
 
-        # Same commit - no changes
-        if previous_state["lastCommitSha"] == self._config.currentCommit:
-            print("No changes detected")
-            return (False, None)
-
         # Check for force push
         is_force_push = self._github.is_force_push(
             self._config.owner,
@@ -206,6 +307,7 @@ class IndexManager:
             previous_state["lastCommitSha"],
             self._config.currentCommit,
         )
+        self._comparison = comparison
 
         # Too many commits
         max_commits = self._config.maxCommits or DEFAULT_MAX_COMMITS
@@ -223,15 +325,8 @@ class IndexManager:
                 f"too_many_files ({comparison['totalChanges']} > {max_files})",
             )
 
-        # Check if ignore files changed
-        ignore_changed = self._github.ignore_files_changed(
-            self._config.owner,
-            self._config.repo,
-            previous_state["lastCommitSha"],
-            self._config.currentCommit,
-        )
-
-        if ignore_changed:
+        # Check if ignore files changed (using the comparison we already have)
+        if any(change.path in IGNORE_FILES for change in comparison["files"]):
             return (True, "ignore_files_changed")
 
         return (False, None)
@@ -253,13 +348,25 @@ class IndexManager:
             self._config.owner, self._config.repo, self._config.currentCommit
         )
 
-        # Add all files to index
-        files_to_index = [
-            File(path=path, contents=contents) for path, contents in files.items()
-        ]
-
-        print(f"Adding {len(files_to_index)} files to index...")
-        self._context.add_to_index(files_to_index)
+        # Add all files to index in fixed-size batches, popping them from the
+        # downloaded dict so their contents can be freed as we go instead of
+        # holding a second full copy of the repository as File objects.
+        # Batches do not wait for indexing, so uploads are not stalled behind
+        # the backend; one wait at the end covers every batch before the state
+        # is exported. (The SDK has no public call that waits on only the
+        # newly uploaded blobs, so wait_for_indexing() checks them all.)
+        files_indexed = len(files)
+        print(f"Adding {files_indexed} files to index...")
+        batch: list[File] = []
+        while files:
+            path, contents = files.popitem()
+            batch.append(File(path=path, contents=contents))
+            if len(batch) >= INDEX_BATCH_SIZE:
+                self._context.add_to_index(batch, wait_for_indexing=False)
+                batch = []
+        if batch:
+            self._context.add_to_index(batch, wait_for_indexing=False)
+        self._context.wait_for_indexing()
 
         # Export DirectContext state
         context_state = self._context.export()
@@ -280,7 +387,7 @@ class IndexManager:
         return IndexResult(
             success=True,
             type="full",
-            filesIndexed=len(files_to_index),
+            filesIndexed=files_indexed,
             filesDeleted=0,
             checkpointId=context_state.checkpoint_id or "",
             commitSha=self._config.currentCommit,
@@ -299,27 +406,16 @@ class IndexManager:
         """
         print("Performing incremental update...")
 
-        # Create a temporary file with the previous context state
-        # Use delete=False because Windows can't reopen a NamedTemporaryFile while it's open
-        temp_file = tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", prefix="github-indexer-incremental-", delete=False
+        # Create a new context from the previous state, in memory rather than
+        # round-tripping it through a temporary file for import_from_file
+        self._context = DirectContext.import_state(
+            DirectContextState.from_dict(previous_state["contextState"]),
+            api_key=self._config.apiToken,
+            api_url=self._config.apiUrl,
         )
-        temp_path = Path(temp_file.name)
-        try:
-            json.dump(previous_state["contextState"], temp_file, indent=2)
-            temp_file.close()  # Close before reading on Windows
-
-            # Create a new context from the previous state
-            self._context = DirectContext.import_from_file(
-                str(temp_path),
-                api_key=self._config.apiToken,
-                api_url=self._config.apiUrl,
-            )
-        finally:
-            temp_path.unlink(missing_ok=True)
 
-        # Get file changes
-        comparison = self._github.compare_commits(
+        # Get file changes, reusing the comparison from _should_full_reindex
+        comparison = self._comparison or self._github.compare_commits(
             self._config.owner,
             self._config.repo,
             previous_state["lastCommitSha"],
@@ -348,8 +444,8 @@ class IndexManager:
             "repository": previous_state["repository"],
         }
 
-        # Save state
-        self._save_state(new_state)
+        # Save only what changed since the previous state
+        self._save_state_delta(previous_state, new_state)
 
         return IndexResult(
             success=True,
@@ -372,24 +468,17 @@ class IndexManager:
         Returns:
             Tuple of (files_to_add, files_to_delete).
         """
-        files_to_add: list[File] = []
-        files_to_delete: list[str] = []
-
-        for change in changes:
-            if change.status in ("added", "modified"):
-                if change.contents:
-                    files_to_add.append(
-                        File(path=change.path, contents=change.contents)
-                    )
-            elif change.status == "removed":
-                files_to_delete.append(change.path)
-            elif change.status == "renamed":
-                if change.previousFilename:
-                    files_to_delete.append(change.previousFilename)
-                if change.contents:
-                    files_to_add.append(
-                        File(path=change.path, contents=change.contents)
-                    )
+        files_to_add = [
+            File(path=change.path, contents=change.contents)
+            for change in changes
+            if change.status in ("added", "modified", "renamed") and change.contents
+        ]
+        # Renamed files drop their old path; removed files drop their own
+        files_to_delete = [
+            change.previousFilename if change.status == "renamed" else change.path
+            for change in changes
+            if change.status == "removed"
+            or (change.status == "renamed" and change.previousFilename)
+        ]
 
         return files_to_add, files_to_delete
-
@@ -8,13 +8,13 @@ Usage:
 """
 
 import os
-import re
 import sys
 
 from auggie_sdk.context import DirectContext
 
 from .index_manager import IndexManager
 from .models import IndexConfig
+from .state_paths import default_state_path
 
 
 def get_api_credentials() -> tuple[str, str]:
@@ -93,10 +93,7 @@ def load_config() -> IndexConfig:
 
 def get_state_path(branch: str) -> str:
     """Get the state file path for the current branch."""
-    sanitized_branch = re.sub(r"[^a-zA-Z0-9\-_]", "-", branch)
-    return os.environ.get(
-        "STATE_PATH", f".augment-index-state/{sanitized_branch}/state.json"
-    )
+    return os.environ.get("STATE_PATH", default_state_path(branch))
 
 
 def main() -> None:
@@ -152,8 +149,10 @@ def main() -> None:
                 f"checkpoint_id={result.checkpointId}",
                 f"commit_sha={result.commitSha}",
             ]
-            with open(github_output, "a") as f:
-                f.write("\n".join(output_lines) + "\n")
+            # Append all outputs with a single unbuffered write
+            payload = ("\n".join(output_lines) + "\n").encode()
+            with open(github_output, "ab", buffering=0) as f:
+                f.write(payload)
 
         print("\nIndexing completed successfully!")
 
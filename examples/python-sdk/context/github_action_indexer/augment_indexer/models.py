@@ -37,7 +37,7 @@ class IndexState(TypedDict):
     """Repository information - used to verify we're indexing the same repository"""
 
 
-@dataclass
+@dataclass(slots=True)
 class FileChange:
     """
     Represents a file change detected between commits.
@@ -61,7 +61,7 @@ class FileChange:
     """Blob name from previous index (for modified/removed files)"""
 
 
-@dataclass
+@dataclass(slots=True)
 class IndexConfig:
     """
     Configuration for the GitHub Action Indexer.
@@ -97,7 +97,7 @@ class IndexConfig:
     """Maximum file changes before full re-index"""
 
 
-@dataclass
+@dataclass(slots=True)
 class IndexResult:
     """
     Result from an indexing operation.
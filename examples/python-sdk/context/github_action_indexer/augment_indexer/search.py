@@ -9,36 +9,27 @@ Usage:
 """
 
 import argparse
-import json
 import os
-import re
 import sys
-import tempfile
-from pathlib import Path
 from typing import Optional
 
-from auggie_sdk.context import DirectContext
+from auggie_sdk.context import DirectContext, DirectContextState
 
+from . import serialization
 from .models import IndexState
+from .state_paths import default_state_path
 
 
 def get_state_path() -> str:
     """Get the state file path for the current branch."""
     branch = os.environ.get("BRANCH", "main")
-    sanitized_branch = re.sub(r"[^a-zA-Z0-9\-_]", "-", branch)
-    return os.environ.get(
-        "STATE_PATH", f".augment-index-state/{sanitized_branch}/state.json"
-    )
+    return os.environ.get("STATE_PATH", default_state_path(branch))
 
 
 def load_state(state_path: str) -> Optional[IndexState]:
     """Load index state from file system."""
-    try:
-        with open(state_path, "r") as f:
-            data = f.read()
-        return json.loads(data)
-    except FileNotFoundError:
-        return None
+    state, _ = serialization.load_index_state(state_path)
+    return state
 
 
 def main() -> None:
@@ -89,22 +80,12 @@ def main() -> None:
             print("  python -m github_action_indexer index", file=sys.stderr)
             sys.exit(1)
 
-        # Create a temporary file with the context state for import
-        # Use delete=False because Windows can't reopen a NamedTemporaryFile while it's open
-        temp_file = tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", prefix="github-indexer-state-", delete=False
+        # Import the state directly; no temporary file is needed
+        context = DirectContext.import_state(
+            DirectContextState.from_dict(state["contextState"]),
+            api_key=api_token,
+            api_url=api_url,
         )
-        temp_path = Path(temp_file.name)
-        try:
-            json.dump(state["contextState"], temp_file, indent=2)
-            temp_file.close()  # Close before reading on Windows
-
-            # Import state using DirectContext.import_from_file
-            context = DirectContext.import_from_file(
-                str(temp_path), api_key=api_token, api_url=api_url
-            )
-        finally:
-            temp_path.unlink(missing_ok=True)
 
         file_count = len(state["contextState"].get("blobs", []))
 
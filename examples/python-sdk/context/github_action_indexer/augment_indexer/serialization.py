@@ -0,0 +1,102 @@
+"""
+JSON serialization and loading for index state.
+
+Uses orjson when it is installed, which is several times faster on the large
+blob lists in contextState, and falls back to the standard library otherwise.
+Both paths produce and accept UTF-8 encoded bytes.
+"""
+
+import json
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from .models import IndexState
+
+# Raised by loads() on malformed input (orjson's error subclasses it)
+JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """
+    Serialize an object to compact (or 2-space indented) JSON bytes.
+
+    Args:
+        obj: The JSON-serializable object.
+        indent: Indent the output for readability.
+
+    Returns:
+        The UTF-8 encoded JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2).encode()
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def loads(data: bytes) -> Any:
+    """
+    Deserialize JSON bytes.
+
+    Args:
+        data: The UTF-8 encoded JSON.
+
+    Returns:
+        The decoded object.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def state_log_path(state_path: str) -> str:
+    """Path of the delta log kept next to a state snapshot."""
+    return state_path + ".log"
+
+
+def load_index_state(state_path: str) -> tuple[Optional[IndexState], int]:
+    """
+    Load the state snapshot and replay any deltas logged after it.
+
+    Args:
+        state_path: Path to the state snapshot file.
+
+    Returns:
+        Tuple of (state, number of deltas replayed). The state is None if no
+        snapshot exists.
+    """
+    try:
+        with open(state_path, "rb") as f:
+            state: IndexState = loads(f.read())
+    except FileNotFoundError:
+        return None, 0
+
+    try:
+        with open(state_log_path(state_path), "rb") as f:
+            lines = f.readlines()
+    except FileNotFoundError:
+        return state, 0
+
+    context_state = state["contextState"]
+    blobs = dict(context_state["blobs"])
+    count = 0
+    for line in lines:
+        try:
+            delta = loads(line)
+        except JSONDecodeError:
+            # A run interrupted mid-write can leave a partial last line
+            break
+        for blob_name in delta["blobsRemoved"]:
+            blobs.pop(blob_name, None)
+        blobs.update(delta["blobsAdded"])
+        context_state["checkpointId"] = delta["checkpointId"]
+        context_state["addedBlobs"] = delta["addedBlobs"]
+        context_state["deletedBlobs"] = delta["deletedBlobs"]
+        state["lastCommitSha"] = delta["lastCommitSha"]
+        count += 1
+    context_state["blobs"] = [list(entry) for entry in blobs.items()]
+    return state, count
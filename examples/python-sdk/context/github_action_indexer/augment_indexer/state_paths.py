@@ -0,0 +1,30 @@
+"""
+Where index state is stored by default.
+
+Kept free of third-party imports so both the indexer and the lightweight
+search entry point can use it.
+"""
+
+import re
+import string
+
+# Characters not allowed in the per-branch state directory name. ASCII
+# branch names (the usual case) go through str.translate; the regex is only
+# needed to also replace non-ASCII characters.
+_BRANCH_SANITIZE_RE = re.compile(r"[^a-zA-Z0-9\-_]")
+_BRANCH_SANITIZE_TABLE = str.maketrans(
+    {
+        chr(c): "-"
+        for c in range(128)
+        if chr(c) not in string.ascii_letters + string.digits + "-_"
+    }
+)
+
+
+def default_state_path(branch: str) -> str:
+    """Default state file path for a branch (used when STATE_PATH is unset)."""
+    if branch.isascii():
+        sanitized_branch = branch.translate(_BRANCH_SANITIZE_TABLE)
+    else:
+        sanitized_branch = _BRANCH_SANITIZE_RE.sub("-", branch)
+    return f".augment-index-state/{sanitized_branch}/state.json"
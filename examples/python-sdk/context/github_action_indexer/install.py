@@ -65,7 +65,9 @@ def copy_directory(src: Path, dst: Path) -> None:
     def ignore_patterns(directory: str, files: list[str]) -> list[str]:
         return [f for f in files if f == "__pycache__" or f.endswith(".pyc")]
     
-    shutil.copytree(src, dst, ignore=ignore_patterns)
+    # shutil.copy keeps the file mode but, unlike the default copy2, skips
+    # copying timestamps and extended attributes, which git doesn't track
+    shutil.copytree(src, dst, ignore=ignore_patterns, copy_function=shutil.copy)
 
 
 def update_gitignore(target_dir: Path) -> None:
@@ -81,7 +83,10 @@ def update_gitignore(target_dir: Path) -> None:
         addition = "\n# Augment indexer files\n.augment-index-state/\n"
         if existing_content and not existing_content.endswith("\n"):
             addition = "\n" + addition
-        gitignore_path.write_text(existing_content + addition)
+        # Append instead of rewriting the file, so an interrupted install
+        # can't truncate the existing entries
+        with gitignore_path.open("a") as f:
+            f.write(addition)
         log_success("Updated .gitignore")
     else:
         log_warning(".gitignore already contains Augment indexer entries")
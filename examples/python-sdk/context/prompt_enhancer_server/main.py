@@ -18,23 +18,28 @@ Usage:
 Endpoints:
     POST /enhance - Enhance a prompt (body: {"prompt": "..."})
     GET  /health  - Health check
+
+Add ?pretty=1 to get indented JSON instead of compact output.
 """
 
 import json
-import re
 import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import datetime
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Any, TypedDict
-from urllib.parse import urlparse
+from urllib.parse import parse_qs, urlparse
 
 from auggie_sdk.context import FileSystemContext
 
 PORT = 3001
 
-# Regex for extracting enhanced prompt from AI response
-ENHANCED_PROMPT_REGEX = re.compile(r"<enhanced-prompt>(.*?)</enhanced-prompt>", re.DOTALL)
+# Tags around the enhanced prompt in the AI response
+ENHANCED_PROMPT_OPEN = "<enhanced-prompt>"
+ENHANCED_PROMPT_CLOSE = "</enhanced-prompt>"
 
 
 # --- Response Parser ---
@@ -50,10 +55,15 @@ def parse_enhanced_prompt(response: str) -> str | None:
     Returns:
         The enhanced prompt text, or None if not found
     """
-    match = ENHANCED_PROMPT_REGEX.search(response)
-    if match and match.group(1):
-        return match.group(1).strip()
-    return None
+    # Text between the first opening tag and the first closing tag after it
+    start = response.find(ENHANCED_PROMPT_OPEN)
+    if start < 0:
+        return None
+    start += len(ENHANCED_PROMPT_OPEN)
+    end = response.find(ENHANCED_PROMPT_CLOSE, start)
+    if end <= start:
+        return None
+    return response[start:end].strip()
 
 
 # --- Enhance Handler ---
@@ -66,10 +76,34 @@ class EnhanceResponse(TypedDict):
     enhanced: str
 
 
+# Maximum number of enhanced prompts kept in memory
+ENHANCE_CACHE_SIZE = 256
+
+# Recent enhancements keyed by the exact original prompt, least recently used
+# first. Prompts are not normalized: whitespace can matter inside code blocks.
+_enhance_cache: "OrderedDict[str, str]" = OrderedDict()
+_enhance_cache_lock = threading.Lock()
+
+# Enhancements currently being computed, keyed by prompt, so identical
+# concurrent requests wait for the same model call instead of repeating it
+_inflight: dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+ENHANCE_TIMEOUT = 120  # seconds
+
+# FileSystemContext talks to a single auggie process over one stdio pipe and
+# is not thread-safe, so every SDK call on the shared context holds this lock.
+# Distinct prompts are enhanced one at a time; /health and cache hits are not.
+_context_lock = threading.Lock()
+
+
 def handle_enhance(prompt: str, context: FileSystemContext) -> EnhanceResponse:
     """
     Handle prompt enhancement request using search_and_ask
 
+    Repeated prompts are answered from an in-memory LRU cache, and identical
+    prompts that arrive while one is being enhanced share its result, instead
+    of calling the model again.
+
     Args:
         prompt: The original prompt to enhance
         context: FileSystemContext instance
@@ -77,6 +111,47 @@ def handle_enhance(prompt: str, context: FileSystemContext) -> EnhanceResponse:
     Returns:
         EnhanceResponse with original and enhanced prompts
     """
+    with _enhance_cache_lock:
+        cached = _enhance_cache.get(prompt)
+        if cached is not None:
+            _enhance_cache.move_to_end(prompt)
+    if cached is not None:
+        return {"original": prompt, "enhanced": cached}
+
+    with _inflight_lock:
+        future = _inflight.get(prompt)
+        is_owner = future is None
+        if is_owner:
+            future = _inflight[prompt] = Future()
+
+    if not is_owner:
+        # The same prompt is already being enhanced; share its result
+        return {"original": prompt, "enhanced": future.result(timeout=ENHANCE_TIMEOUT)}
+
+    try:
+        enhanced = _enhance(prompt, context)
+        future.set_result(enhanced)
+    except BaseException as error:
+        future.set_exception(error)
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[prompt]
+
+    with _enhance_cache_lock:
+        _enhance_cache[prompt] = enhanced
+        _enhance_cache.move_to_end(prompt)
+        if len(_enhance_cache) > ENHANCE_CACHE_SIZE:
+            _enhance_cache.popitem(last=False)
+
+    return {
+        "original": prompt,
+        "enhanced": enhanced,
+    }
+
+
+def _enhance(prompt: str, context: FileSystemContext) -> str:
+    """Ask the model to enhance a prompt and parse the enhanced text"""
     print(f'\n[{datetime.now().isoformat()}] Enhancing prompt: "{prompt}"')
 
     # Build the enhancement instruction
@@ -96,17 +171,14 @@ def handle_enhance(prompt: str, context: FileSystemContext) -> EnhanceResponse:
     )
 
     # Use search_and_ask to get the enhancement with relevant codebase context
-    response = context.search_and_ask(prompt, enhancement_prompt)
+    with _context_lock:
+        response = context.search_and_ask(prompt, enhancement_prompt)
 
     # Parse the enhanced prompt from the response
     enhanced = parse_enhanced_prompt(response)
     if not enhanced:
         raise ValueError("Failed to parse enhanced prompt from response")
-
-    return {
-        "original": prompt,
-        "enhanced": enhanced,
-    }
+    return enhanced
 
 
 # --- HTTP Server ---
@@ -115,21 +187,59 @@ def handle_enhance(prompt: str, context: FileSystemContext) -> EnhanceResponse:
 context: FileSystemContext | None = None
 workspace_dir: str = "."
 
+# Set once shutdown starts, so a context that finishes initializing after that
+# is closed instead of published; guarded by _context_state_lock
+_shutting_down = False
+_context_state_lock = threading.Lock()
+
 
 def initialize_context():
     """Initialize the FileSystem Context"""
     global context
     print("Initializing FileSystem Context...")
-    context = FileSystemContext.create(workspace_dir, debug=False)
+    created = FileSystemContext.create(workspace_dir, debug=False)
+    with _context_state_lock:
+        if _shutting_down:
+            created.close()
+            return
+        context = created
     print("FileSystem Context initialized\n")
 
 
+def close_context():
+    """Close the context, including one that is still being initialized"""
+    global _shutting_down
+    with _context_state_lock:
+        _shutting_down = True
+        if context:
+            context.close()
+
+
+def _initialize_context_in_background(server: ThreadingHTTPServer):
+    """Initialize the context while the server is already answering /health"""
+    try:
+        initialize_context()
+    except Exception as error:
+        print(f"Failed to initialize: {error}")
+        # Nothing can be enhanced without a context, so stop serving and let
+        # main() exit with an error instead of answering 503 forever
+        server.shutdown()
+
+
 class RequestHandler(BaseHTTPRequestHandler):
     """HTTP request handler"""
 
+    # Keep connections open between requests; every response sends a
+    # Content-Length so clients can reuse the connection
+    protocol_version = "HTTP/1.1"
+
+    # Indent JSON responses only when the client asks for it with ?pretty=1
+    pretty = False
+
     def do_OPTIONS(self):
         """Handle OPTIONS requests for CORS"""
         self.send_response(200)
+        self.send_header("Content-Length", "0")
         self._send_cors_headers()
         self.end_headers()
 
@@ -141,32 +251,50 @@ class RequestHandler(BaseHTTPRequestHandler):
 
     def _send_json_response(self, status: int, data: dict[str, Any]):
         """Send a JSON response"""
+        if self.pretty:
+            body = json.dumps(data, indent=2).encode()
+        else:
+            body = json.dumps(data, separators=(",", ":")).encode()
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
         self._send_cors_headers()
         self.end_headers()
-        self.wfile.write(json.dumps(data, indent=2).encode())
+        self.wfile.write(body)
+
+    def _parse_pretty(self, query_string: str):
+        """Set self.pretty from the ?pretty=1 query parameter"""
+        # The handler is reused for every request on a keep-alive connection,
+        # so always reset the flag; most requests carry no query string
+        self.pretty = bool(query_string) and (
+            parse_qs(query_string).get("pretty", ["0"])[0] == "1"
+        )
 
     def do_POST(self):
         """Handle POST requests"""
         parsed_url = urlparse(self.path)
         path = parsed_url.path
+        self._parse_pretty(parsed_url.query)
+
+        # Always consume the body so the next request on this connection
+        # starts at the right place
+        content_length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(content_length)
 
         if path == "/enhance":
-            self._handle_enhance()
+            self._handle_enhance(body)
         else:
             self._send_json_response(404, {"error": "Not found"})
 
-    def _handle_enhance(self):
+    def _handle_enhance(self, body: bytes):
         """Handle enhance endpoint"""
         if context is None:
             self._send_json_response(503, {"error": "Context not initialized yet"})
             return
 
-        content_length = int(self.headers.get("Content-Length", 0))
-        body = self.rfile.read(content_length).decode("utf-8")
-
         try:
+            # json.loads decodes UTF-8 bytes itself, so there is no separate
+            # decode to a str first
             data = json.loads(body)
             prompt = data.get("prompt")
 
@@ -184,6 +312,7 @@ class RequestHandler(BaseHTTPRequestHandler):
         """Handle GET requests"""
         parsed_url = urlparse(self.path)
         path = parsed_url.path
+        self._parse_pretty(parsed_url.query)
 
         if path == "/health":
             self._send_json_response(
@@ -202,6 +331,24 @@ class RequestHandler(BaseHTTPRequestHandler):
         pass
 
 
+def create_server(port: int = PORT) -> ThreadingHTTPServer:
+    """
+    Create the HTTP server; the context does not need to exist yet
+
+    main() binds the server first and runs initialize_context() on a
+    background thread. Until that finishes, /health reports contextReady
+    false and /enhance returns 503. Shut down with close_context(), which
+    also closes a context that is still being created. Callers such as the
+    test may instead call initialize_context() before serving.
+
+    Args:
+        port: Port to listen on (0 picks a free port)
+    """
+    # Serve each request on its own thread so a slow enhancement does not
+    # block /health or cache hits; enhancements still share _context_lock
+    return ThreadingHTTPServer(("", port), RequestHandler)
+
+
 def main():
     """Main function"""
     global workspace_dir
@@ -216,10 +363,15 @@ def main():
     print(f"Starting server on port {PORT}...\n")
 
     server = None
+    init_thread = None
     try:
-        initialize_context()
-
-        server = HTTPServer(("", PORT), RequestHandler)
+        # Bind first and initialize the context in the background, so the
+        # server answers /health (with contextReady false) right away
+        server = create_server()
+        init_thread = threading.Thread(
+            target=_initialize_context_in_background, args=(server,), daemon=True
+        )
+        init_thread.start()
         print(f"✅ Server running at http://localhost:{PORT}/")
         print("\nExample requests:")
         print(
@@ -231,18 +383,23 @@ def main():
         print("\nPress Ctrl+C to stop\n")
 
         server.serve_forever()
+        # serve_forever() only returns when initialization failed
+        server.server_close()
+        sys.exit(1)
     except KeyboardInterrupt:
         print("\n\nShutting down...")
-        if context:
-            context.close()
+        close_context()
         if server:
             server.server_close()
+        if init_thread and init_thread.is_alive():
+            # Wait for the context being created, which closes it on finishing
+            print("Waiting for context initialization to finish...")
+            init_thread.join()
         print("Server stopped")
         sys.exit(0)
     except Exception as error:
-        print(f"Failed to initialize: {error}")
-        if context:
-            context.close()
+        print(f"Failed to start server: {error}")
+        close_context()
         if server:
             server.server_close()
         sys.exit(1)
@@ -6,36 +6,22 @@ This example starts an HTTP server on port 3001 that provides:
 - GET /health - Health check endpoint
 - POST /enhance - Prompt enhancement endpoint
 
-The test starts the server, verifies the endpoints work, then shuts it down.
+The test runs the server in-process on a free port, verifies the endpoints
+work, then shuts it down.
 """
 
 import json
-import subprocess
 import sys
-import time
-import urllib.error
+import threading
 import urllib.request
 from pathlib import Path
 
-PORT = 3001
-BASE_URL = f"http://localhost:{PORT}"
-STARTUP_TIMEOUT = 30  # seconds to wait for server to start
-REQUEST_TIMEOUT = 60  # seconds for each request
+# Make the prompt_enhancer_server package importable when run as a script
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from prompt_enhancer_server import main as server_main  # noqa: E402
 
-def wait_for_server(url: str, timeout: int = STARTUP_TIMEOUT) -> bool:
-    """Wait for the server to be ready."""
-    start_time = time.time()
-    while time.time() - start_time < timeout:
-        try:
-            req = urllib.request.Request(url, method="GET")
-            with urllib.request.urlopen(req, timeout=5) as response:
-                if response.status == 200:
-                    return True
-        except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError):
-            pass
-        time.sleep(1)
-    return False
+REQUEST_TIMEOUT = 60  # seconds for each request
 
 
 def make_get_request(url: str, timeout: int = REQUEST_TIMEOUT) -> dict:
@@ -60,46 +46,32 @@ def make_post_request(url: str, data: dict, timeout: int = REQUEST_TIMEOUT) -> d
 
 def main():
     """Run the prompt_enhancer_server example and verify it works."""
-    # Get the package directory and workspace
-    package_dir = Path(__file__).parent
-    workspace_dir = str(package_dir)
-    # Run from the parent directory so module execution works
-    context_dir = package_dir.parent
-
-    print(f"Starting server with: python -m prompt_enhancer_server {workspace_dir}")
-    print(f"Working directory: {context_dir}")
-
-    # Start the server as a subprocess using module execution
-    server_process = subprocess.Popen(
-        [sys.executable, "-m", "prompt_enhancer_server", workspace_dir],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-        cwd=str(context_dir),
-    )
+    # Use the package directory as the workspace
+    workspace_dir = str(Path(__file__).parent.resolve())
+    print(f"Starting server in-process for workspace: {workspace_dir}")
+
+    server_main.workspace_dir = workspace_dir
+    server_main.initialize_context()
+    # The socket is bound here, so requests can be sent as soon as
+    # serve_forever() starts; no need to poll /health
+    server = server_main.create_server(port=0)
+    base_url = f"http://localhost:{server.server_address[1]}"
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
 
     try:
-        # Wait for server to be ready
-        print(f"Waiting for server at {BASE_URL}/health...")
-        if not wait_for_server(f"{BASE_URL}/health"):
-            stdout, stderr = server_process.communicate(timeout=5)
-            print(f"❌ Server failed to start within {STARTUP_TIMEOUT}s")
-            print(f"stdout: {stdout}")
-            print(f"stderr: {stderr}")
-            sys.exit(1)
-
-        print("✓ Server is ready")
+        print(f"✓ Server is ready at {base_url}")
 
         # Test health endpoint
         print("\nTesting /health endpoint...")
-        health = make_get_request(f"{BASE_URL}/health")
+        health = make_get_request(f"{base_url}/health")
         assert health.get("status") == "ok", f"Expected status 'ok', got: {health}"
         print(f"✓ Health check passed: {health}")
 
         # Test enhance endpoint
         print("\nTesting /enhance endpoint...")
         enhance_result = make_post_request(
-            f"{BASE_URL}/enhance",
+            f"{base_url}/enhance",
             {"prompt": "fix the bug"},
         )
         # The enhance should return some result (structure may vary)
@@ -111,12 +83,10 @@ def main():
     finally:
         # Shutdown the server
         print("\nShutting down server...")
-        server_process.terminate()
-        try:
-            server_process.wait(timeout=5)
-        except subprocess.TimeoutExpired:
-            server_process.kill()
-            server_process.wait()
+        server.shutdown()
+        server.server_close()
+        if server_main.context:
+            server_main.context.close()
         print("Server stopped")
 
 
@@ -7,100 +7,101 @@ across multiple messages, unlike the Agent library which requires explicit
 session management.
 """
 
-from auggie_sdk.acp import AuggieACPClient, AgentEventListener
+import argparse
 
+from auggie_sdk.acp import AuggieACPClient
 
-class SimpleListener(AgentEventListener):
-    """Simple listener that prints agent responses."""
+from _listeners import PrintingListener, send
 
-    def on_agent_message_chunk(self, text: str) -> None:
-        print(text, end="", flush=True)
+BANNER = "=" * 80
+
+
+def section(title: str) -> None:
+    """Print a section title between two banner lines, then a blank line."""
+    print(f"{BANNER}\n{title}\n{BANNER}\n")
+
+
+def pause(message: str, interactive: bool) -> None:
+    """Wait for Enter in interactive mode; carry straight on otherwise."""
+    if interactive:
+        input(message)
+
+
+class SimpleListener(PrintingListener):
+    """Simple listener that prints agent responses.
+
+    Streamed chunks are buffered and flushed in batches by PrintingListener
+    instead of flushing stdout on every chunk.
+    """
 
     def on_tool_call(self, tool_call_id: str, title: str, kind=None, status=None) -> None:
         """Called when a tool call starts."""
-        pass
+        self.flush()
 
     def on_tool_response(self, tool_call_id: str, status=None, content=None) -> None:
         """Called when a tool response is received."""
-        pass
+        self.flush()
 
 
-def demo_session_continuity():
+def demo_session_continuity(interactive: bool = True):
     """Demonstrate automatic session continuity."""
-    print("=" * 80)
-    print("DEMO: Automatic Session Continuity in ACP Client")
-    print("=" * 80)
-    print()
+    section("DEMO: Automatic Session Continuity in ACP Client")
 
     # Create client with listener for real-time output
-    client = AuggieACPClient(
-        model="sonnet4.5", listener=SimpleListener()
-    )
+    listener = SimpleListener()
+    client = AuggieACPClient(model="sonnet4.5", listener=listener)
 
     print("Starting ACP client (creates a persistent session)...")
     client.start()
     print(f"✓ Session started: {client.session_id}\n")
 
     # Message 1: Ask agent to remember something
-    print("=" * 80)
-    print("MESSAGE 1: Remember a number")
-    print("=" * 80)
-    print()
-    client.send_message("Remember the number 42. Just acknowledge you'll remember it.")
+    section("MESSAGE 1: Remember a number")
+    send(client, listener, "Remember the number 42. Just acknowledge you'll remember it.")
     print("\n")
 
-    input("Press Enter to send next message...")
+    pause("Press Enter to send next message...", interactive)
     print()
 
     # Message 2: Ask agent to recall it
-    print("=" * 80)
-    print("MESSAGE 2: Recall the number (tests session continuity)")
-    print("=" * 80)
-    print()
-    client.send_message("What number did I ask you to remember?")
+    section("MESSAGE 2: Recall the number (tests session continuity)")
+    send(client, listener, "What number did I ask you to remember?")
     print("\n")
 
-    input("Press Enter to send next message...")
+    pause("Press Enter to send next message...", interactive)
     print()
 
     # Message 3: Do some math with it
-    print("=" * 80)
-    print("MESSAGE 3: Use the number in a calculation")
-    print("=" * 80)
-    print()
-    client.send_message("What is that number multiplied by 2?")
+    section("MESSAGE 3: Use the number in a calculation")
+    send(client, listener, "What is that number multiplied by 2?")
     print("\n")
 
-    input("Press Enter to send next message...")
+    pause("Press Enter to send next message...", interactive)
     print()
 
     # Message 4: Create a function
-    print("=" * 80)
-    print("MESSAGE 4: Create a function")
-    print("=" * 80)
-    print()
-    client.send_message(
-        "Create a Python function called 'greet' that takes a name and returns 'Hello, {name}!'"
+    section("MESSAGE 4: Create a function")
+    send(
+        client,
+        listener,
+        "Create a Python function called 'greet' that takes a name and returns 'Hello, {name}!'",
     )
     print("\n")
 
-    input("Press Enter to send next message...")
+    pause("Press Enter to send next message...", interactive)
     print()
 
     # Message 5: Reference the function we just created
-    print("=" * 80)
-    print("MESSAGE 5: Reference the function (tests code context)")
-    print("=" * 80)
-    print()
-    client.send_message("Now call that greet function with the name 'Alice'")
+    section("MESSAGE 5: Reference the function (tests code context)")
+    send(client, listener, "Now call that greet function with the name 'Alice'")
     print("\n")
 
     # Stop the client
-    print("=" * 80)
+    print(BANNER)
     print("Stopping client...")
     client.stop()
     print("✓ Client stopped")
-    print("=" * 80)
+    print(BANNER)
     print()
 
     print("✅ DEMO COMPLETE!")
@@ -116,10 +117,7 @@ def demo_session_continuity():
 
 def demo_comparison():
     """Show the difference between Agent and ACP client."""
-    print("=" * 80)
-    print("COMPARISON: Agent vs ACP Client Session Management")
-    print("=" * 80)
-    print()
+    section("COMPARISON: Agent vs ACP Client Session Management")
 
     print("Agent Library (subprocess-based):")
     print("-" * 80)
@@ -155,13 +153,22 @@ client.stop()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--interactive",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="wait for Enter between messages (use --no-interactive for scripted runs)",
+    )
+    args = parser.parse_args()
+
     print("\n")
 
     # Show comparison first
     demo_comparison()
 
-    input("Press Enter to run the live demo...")
+    pause("Press Enter to run the live demo...", args.interactive)
     print("\n")
 
     # Run the live demo
-    demo_session_continuity()
+    demo_session_continuity(interactive=args.interactive)
@@ -6,12 +6,16 @@ This example demonstrates all the events in the AgentEventListener interface
 and shows you exactly when each event is triggered and what data it contains.
 """
 
+import io
 import time
+from collections import deque
 from typing import Any, Optional
 
 from auggie_sdk import Auggie
 from auggie_sdk.acp import AgentEventListener
 
+from _listeners import preview_content
+
 
 class DetailedEventLogger(AgentEventListener):
     """
@@ -21,14 +25,19 @@ class DetailedEventLogger(AgentEventListener):
     """
     
     def __init__(self):
-        self.message_chunks = []
+        # Chunks are written straight into one buffer rather than kept as a
+        # list of many small strings; only their number is remembered
+        self.message = io.StringIO()
+        self.message_chunk_count = 0
         self.tool_calls = {}
         self.thoughts = []
-        self.start_time = time.time()
+        # Only differences between timestamps are used, so use the monotonic
+        # clock, which never jumps when the system time is adjusted
+        self.start_time = time.monotonic()
     
     def _timestamp(self) -> str:
         """Get elapsed time since start."""
-        elapsed = time.time() - self.start_time
+        elapsed = time.monotonic() - self.start_time
         return f"[{elapsed:6.2f}s]"
     
     def on_agent_message_chunk(self, text: str) -> None:
@@ -38,7 +47,8 @@ class DetailedEventLogger(AgentEventListener):
         This is the agent's final response to you, streamed in real-time.
         You'll receive many small chunks that together form the complete message.
         """
-        self.message_chunks.append(text)
+        self.message.write(text)
+        self.message_chunk_count += 1
 
         # Show the chunk (with visible quotes to see whitespace)
         print(f"{self._timestamp()} 💬 AGENT MESSAGE CHUNK: {repr(text)}")
@@ -71,15 +81,21 @@ class DetailedEventLogger(AgentEventListener):
             "title": title,
             "kind": kind,
             "status": status,
-            "start_time": time.time(),
-            "responses": []
+            "start_time": time.monotonic(),
+            # Only the most recent responses are kept; response_count has
+            # the total
+            "responses": deque(maxlen=16),
+            "response_count": 0,
         }
 
-        print(f"\n{self._timestamp()} 🔧 TOOL CALL:")
-        print(f"    ID:     {tool_call_id}")
-        print(f"    Title:  {title}")
-        print(f"    Kind:   {kind}")
-        print(f"    Status: {status}")
+        # One print (and one write) per event rather than one per line
+        print(
+            f"\n{self._timestamp()} 🔧 TOOL CALL:\n"
+            f"    ID:     {tool_call_id}\n"
+            f"    Title:  {title}\n"
+            f"    Kind:   {kind}\n"
+            f"    Status: {status}"
+        )
 
     def on_tool_response(
         self,
@@ -95,19 +111,23 @@ class DetailedEventLogger(AgentEventListener):
         - The tool fails with an error
         """
         if tool_call_id in self.tool_calls:
-            self.tool_calls[tool_call_id]["responses"].append({
+            entry = self.tool_calls[tool_call_id]
+            entry["responses"].append({
                 "status": status,
                 "content": content,
-                "time": time.time()
+                "time": time.monotonic()
             })
+            entry["response_count"] += 1
 
-        print(f"{self._timestamp()} 📥 TOOL RESPONSE:")
-        print(f"    ID:     {tool_call_id}")
-        print(f"    Status: {status}")
+        lines = [
+            f"{self._timestamp()} 📥 TOOL RESPONSE:",
+            f"    ID:     {tool_call_id}",
+            f"    Status: {status}",
+        ]
         if content:
             # Show first 100 chars of content
-            content_str = str(content)[:100]
-            print(f"    Content: {content_str}...")
+            lines.append(f"    Content: {preview_content(content)}...")
+        print("\n".join(lines))
     
     def on_agent_thought(self, text: str) -> None:
         """
@@ -126,19 +146,19 @@ class DetailedEventLogger(AgentEventListener):
         print("=" * 80)
         
         print(f"\n📊 Statistics:")
-        print(f"  - Message chunks received: {len(self.message_chunks)}")
+        print(f"  - Message chunks received: {self.message_chunk_count}")
         print(f"  - Tool calls made: {len(self.tool_calls)}")
         print(f"  - Thoughts shared: {len(self.thoughts)}")
         
         print(f"\n💬 Complete Agent Message:")
-        full_message = "".join(self.message_chunks)
+        full_message = self.message.getvalue()
         print(f"  {full_message}")
         
         if self.tool_calls:
             print(f"\n🔧 Tools Used:")
             for tool_id, info in self.tool_calls.items():
                 print(f"  - {info['title']} ({info['kind']})")
-                print(f"    Responses: {len(info['responses'])}")
+                print(f"    Responses: {info['response_count']}")
         
         if self.thoughts:
             print(f"\n💭 Agent Thoughts:")
@@ -6,6 +6,8 @@ This example shows how to provide Python functions that the agent can call
 during execution to accomplish tasks.
 """
 
+import math
+
 from auggie_sdk import Auggie
 
 
@@ -44,11 +46,8 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     Returns:
         Distance in kilometers
     """
-    # Simplified calculation for demo
-    import math
-
     # Haversine formula
-    R = 6371  # Earth's radius in km
+    R = 6371.0  # Earth's radius in km
 
     lat1_rad = math.radians(lat1)
     lat2_rad = math.radians(lat2)
@@ -1,11 +1,7 @@
-import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 
-# Add the parent directory to the path so we can import auggie_sdk
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-
 from auggie_sdk import Auggie
 
 
@@ -17,16 +13,38 @@ class PR:
     author: str
 
 
+@dataclass
+class RecentPRs:
+    connected: bool
+    prs: list[PR]
+
+    def __post_init__(self):
+        # Nested dataclasses are returned as plain dicts
+        self.prs = [PR(**pr) if isinstance(pr, dict) else pr for pr in self.prs]
+
+
 def main():
     agent = Auggie(workspace_root=Path.cwd())
 
-    is_connected = agent.run("are you connected to github?", return_type=bool)
-    if not is_connected:
+    # Check the GitHub connection and list the PRs in one round trip
+    result = agent.run(
+        "Are you connected to github? If so, list the last 3 PRs in the current "
+        "repo; if not, return an empty list of PRs.",
+        return_type=RecentPRs,
+    )
+    if not result.connected:
         raise Exception("Not connected to github")
 
-    prs = agent.run("List the last 3 PRs in the current repo", return_type=list[PR])
+    prs = result.prs
+
+    # Summarize the PRs in parallel. An Auggie instance holds a single
+    # session, so each summary runs on its own agent.
+    def summarize(pr: PR) -> str:
+        with Auggie(workspace_root=Path.cwd()) as summarizer:
+            return summarizer.run(f"summarize PR {pr}", return_type=str)
 
-    summaries = [agent.run(f"summarize PR {pr}", return_type=str) for pr in prs]
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(prs)))) as executor:
+        summaries = list(executor.map(summarize, prs))
 
     for pr, summary in zip(prs, summaries):
         print("Title:", pr.title)
@@ -25,6 +25,10 @@ class MockACPClient(ACPClient):
             "What is the capital of France?": "Paris",
             "List three colors": "Red, Blue, Green",
         }
+        # Lowercased once here so matching a message only lowercases the message
+        self._lookup = [
+            (question.lower(), answer) for question, answer in self._responses.items()
+        ]
     
     def start(self) -> None:
         """Start the mock client."""
@@ -55,8 +59,9 @@ class MockACPClient(ACPClient):
         print(f"Mock client received: {message}")
         
         # Return a predefined response if available
-        for question, answer in self._responses.items():
-            if question.lower() in message.lower():
+        message_lower = message.lower()
+        for question, answer in self._lookup:
+            if question in message_lower:
                 return answer
         
         # Default response
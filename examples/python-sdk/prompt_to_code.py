@@ -17,6 +17,7 @@ Examples:
 """
 
 import argparse
+import os
 import sys
 from pathlib import Path
 from dataclasses import dataclass
@@ -26,12 +27,16 @@ from auggie_sdk import Auggie
 from auggie_sdk.exceptions import AugmentCLIError, AugmentParseError
 
 
-CONVERSION_PROMPT = """
-Analyze this complex prompt and convert it into a well-structured Python program using the Augment SDK.
-
-## The Prompt to Convert:
+# Prompt files larger than this are rejected before they are read; the whole
+# prompt is sent to the model, so anything near this size is almost certainly
+# the wrong file.
+MAX_PROMPT_BYTES = 1024 * 1024
 
-{prompt_content}
+# The instructions come first and the prompt to convert last, so every
+# conversion request starts with the same text (which lets the model
+# provider reuse its cached prefix).
+CONVERSION_PROMPT = """
+Analyze the complex prompt at the end of this message and convert it into a well-structured Python program using the Augment SDK.
 
 ## Your Task:
 
@@ -125,8 +130,19 @@ Analyze this complex prompt and convert it into a well-structured Python program
    Return ONLY the complete Python program code, with no additional explanation.
    The code should be ready to save to a file and run immediately.
    Start with #!/usr/bin/env python3 and include a proper docstring.
+
+## The Prompt to Convert:
+
+{prompt_content}
 """
 
+# Split once at import time, so building a request is a plain concatenation
+# rather than a str.format() pass over the whole template
+_PROMPT_PREFIX, _PROMPT_SUFFIX = (
+    part.replace("{{", "{").replace("}}", "}")
+    for part in CONVERSION_PROMPT.split("{prompt_content}")
+)
+
 
 @dataclass
 class ConversionResult:
@@ -144,7 +160,14 @@ def read_prompt_file(file_path: str) -> str:
         if not path.exists():
             raise FileNotFoundError(f"Prompt file not found: {file_path}")
 
-        return path.read_text(encoding="utf-8")
+        size = path.stat().st_size
+        if size > MAX_PROMPT_BYTES:
+            raise ValueError(
+                f"Prompt file is too large ({size} bytes, limit {MAX_PROMPT_BYTES})"
+            )
+
+        with path.open("r", encoding="utf-8") as f:
+            return f.read()
     except Exception as e:
         raise RuntimeError(f"Failed to read prompt file: {e}")
 
@@ -169,8 +192,8 @@ def convert_prompt_to_code(
         # Create agent for conversion
         agent = Auggie(model=model, workspace_root=workspace_root or str(Path.cwd()))
 
-        # Format the conversion prompt
-        full_prompt = CONVERSION_PROMPT.format(prompt_content=prompt_content)
+        # Build the conversion prompt
+        full_prompt = _PROMPT_PREFIX + prompt_content + _PROMPT_SUFFIX
 
         # Get the generated code
         print("🤖 Analyzing prompt and generating SDK program...")
@@ -201,20 +224,37 @@ def save_generated_code(code: str, output_file: Optional[str] = None) -> str:
     Returns:
         The path where the code was saved
     """
+    # New files are created executable, so there is no window in which the
+    # file exists with the default mode
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+
     if output_file:
         output_path = Path(output_file)
+        fd = os.open(output_path, flags, 0o755)
     else:
-        # Generate a default output filename
-        output_path = Path("generated_sdk_program.py")
+        # Generate a default output filename. O_EXCL claims the first free
+        # name in the same call that creates it, so earlier output is kept.
+        default_path = output_path = Path("generated_sdk_program.py")
         counter = 1
-        while output_path.exists():
-            output_path = Path(f"generated_sdk_program_{counter}.py")
-            counter += 1
-
-    output_path.write_text(code, encoding="utf-8")
-
-    # Make the file executable
-    output_path.chmod(0o755)
+        while True:
+            try:
+                fd = os.open(output_path, flags | os.O_EXCL, 0o755)
+                break
+            except FileExistsError:
+                output_path = Path(f"generated_sdk_program_{counter}.py")
+                counter += 1
+        if output_path != default_path:
+            print(
+                f"{default_path} already exists; saving to {output_path} instead "
+                "(use --output to choose the file name)"
+            )
+
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(code)
+
+    # The open() mode is filtered by the umask and only applies when the file
+    # is created, so set the executable bits explicitly
+    os.chmod(output_path, 0o755)
 
     return str(output_path)
 
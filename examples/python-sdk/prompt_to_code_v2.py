@@ -24,12 +24,64 @@ import json
 import subprocess
 import sys
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Set
 
 from auggie_sdk import Auggie
 
+# Prompt files larger than this are rejected before they are read
+MAX_PROMPT_BYTES = 1024 * 1024
+
+
+# Instructions for each stage. Every request starts with the fixed
+# instructions and ends with the parts that change (prompt, spec, code), so
+# requests share a common prefix the model provider can cache.
+
+SPEC_INSTRUCTIONS = """Analyze the prompt at the end of this message and create a detailed specification for an SDK program.
+
+Create a specification that includes:
+1. Purpose: What the program should accomplish
+2. Input requirements: What data/files it needs
+3. Output requirements: What it should produce
+4. Stages: Sequential steps in the workflow
+5. Data structures: Any dataclasses or types needed
+6. Test strategy: How to validate it works (WITHOUT modifying real user data)
+7. Safety considerations: What could go wrong and how to prevent it
+
+Return the specification as a JSON object."""
+
+IMPLEMENTATION_INSTRUCTIONS = """Based on the specification and original prompt at the end of this message, implement a complete Python program using the Augment SDK.
+
+REQUIREMENTS:
+1. Use `from auggie_sdk import Auggie` for imports
+2. Initialize agent with: `agent = Auggie()` or `agent = Auggie(workspace_root=".")`
+3. Use `agent.run(prompt)` or `agent.run(prompt, return_type=Type)` - DO NOT call agent() directly
+4. Use `agent.session()` for multi-step workflows with shared context
+5. Include proper error handling
+6. Add a main() function that can be run directly
+7. Include docstrings and comments
+8. Follow the test strategy from the spec to ensure safety
+9. Start with #!/usr/bin/env python3 and a module docstring
+
+Generate ONLY the complete Python code, no explanations."""
+
+FIX_INSTRUCTIONS = """The generated code at the end of this message has validation errors. Please fix them.
+
+Fix all errors and return the corrected code. Return ONLY the complete Python code, no explanations."""
+
+CLEANUP_INSTRUCTIONS = """Polish the working SDK program at the end of this message for production use.
+
+Improvements to make:
+1. Ensure all docstrings are clear and complete
+2. Add helpful comments for complex logic
+3. Ensure error messages are user-friendly
+4. Verify the code follows Python best practices
+5. Make sure the test strategy from the spec is implemented
+
+Return ONLY the polished Python code, no explanations."""
+
 
 @dataclass
 class ProgramSpec:
@@ -69,82 +121,114 @@ class ConversionResult:
     error: Optional[str]
 
 
-def validate_python_syntax(code: str) -> tuple[bool, List[str]]:
+# Modules generated programs are expected to import (common Python stdlib +
+# augment SDK); anything else is reported as a warning
+ALLOWED_IMPORTS = frozenset({
+    "__future__",
+    "auggie_sdk",
+    "augment",
+    "dataclasses",
+    "typing",
+    "json",
+    "pathlib",
+    "datetime",
+    "sys",
+    "os",
+    "argparse",
+    "logging",
+    "tempfile",
+    "subprocess",
+    "collections",
+    "re",
+    "time",
+    "shutil",
+    "glob",
+    "itertools",
+    "functools",
+    "enum",
+    "abc",
+    "contextlib",
+    "io",
+    "traceback",
+    "importlib",
+})
+
+# Method names the dry-run treats as file deletion
+DELETION_METHODS = frozenset({"unlink", "rmdir", "remove", "rmtree"})
+
+
+@dataclass
+class CodeAnalysis:
+    """Everything the validators need from a single parse of the code."""
+
+    syntax_errors: List[str]
+    import_roots: Set[str]  # top-level names of the imported modules
+    deletion_calls: int
+
+
+def _analyze(code: str) -> CodeAnalysis:
+    """
+    Parse the code once and collect, in a single walk, what the syntax,
+    import and dry-run checks look at.
+    """
+    try:
+        tree = ast.parse(code, filename="<generated>")
+    except SyntaxError as e:
+        return CodeAnalysis(
+            syntax_errors=[f"Syntax error at line {e.lineno}: {e.msg}"],
+            import_roots=set(),
+            deletion_calls=0,
+        )
+
+    import_roots = set()
+    deletion_calls = 0
+    for node in ast.walk(tree):
+        # Only the root module counts, so "auggie_sdk.acp" is "auggie_sdk"
+        if isinstance(node, ast.Import):
+            import_roots.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.module:
+                import_roots.add(node.module.split(".")[0])
+        elif (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr in DELETION_METHODS
+        ):
+            deletion_calls += 1
+
+    return CodeAnalysis(
+        syntax_errors=[],
+        import_roots=import_roots,
+        deletion_calls=deletion_calls,
+    )
+
+
+def validate_python_syntax(analysis: CodeAnalysis) -> tuple[bool, List[str]]:
     """
-    Validate Python syntax by parsing the code.
+    Report whether the code parsed.
 
     Returns:
         (is_valid, errors)
     """
-    errors = []
-    try:
-        ast.parse(code)
-        return True, []
-    except SyntaxError as e:
-        errors.append(f"Syntax error at line {e.lineno}: {e.msg}")
-        return False, errors
+    return not analysis.syntax_errors, list(analysis.syntax_errors)
 
 
-def check_imports(code: str) -> tuple[bool, List[str]]:
+def check_imports(analysis: CodeAnalysis) -> tuple[bool, List[str]]:
     """
     Check if all imports in the code are valid.
 
     Returns:
         (all_valid, warnings)
     """
-    warnings = []
+    # One warning per unexpected module, however often it is imported
+    unexpected = analysis.import_roots - ALLOWED_IMPORTS
+    warnings = [f"Warning: Unexpected import '{name}'" for name in sorted(unexpected)]
 
-    # List of allowed imports (common Python stdlib + augment SDK)
-    allowed_imports = {
-        "__future__",
-        "auggie_sdk",
-        "augment",
-        "dataclasses",
-        "typing",
-        "json",
-        "pathlib",
-        "datetime",
-        "sys",
-        "os",
-        "argparse",
-        "logging",
-        "tempfile",
-        "subprocess",
-        "collections",
-        "re",
-        "time",
-        "shutil",
-        "glob",
-        "itertools",
-        "functools",
-        "enum",
-        "abc",
-        "contextlib",
-        "io",
-        "traceback",
-        "importlib",
-    }
+    return True, warnings
 
-    try:
-        tree = ast.parse(code)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    # Check root module name for imports like "auggie_sdk.acp"
-                    root_module = alias.name.split('.')[0]
-                    if root_module not in allowed_imports:
-                        warnings.append(f"Warning: Unexpected import '{alias.name}'")
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    # Check root module name for submodule imports
-                    root_module = node.module.split('.')[0]
-                    if root_module not in allowed_imports:
-                        warnings.append(f"Warning: Unexpected import from '{node.module}'")
-
-        return True, warnings
-    except Exception as e:
-        warnings.append(f"Warning: Error checking imports: {e}")
-        return True, warnings
+
+class TypeCheckError(Exception):
+    """Raised when mypy could not be run on the generated code."""
 
 
 def run_type_check(code: str, workspace_root: str) -> tuple[bool, List[str]]:
@@ -153,16 +237,21 @@ def run_type_check(code: str, workspace_root: str) -> tuple[bool, List[str]]:
 
     Returns:
         (passed, warnings)
+
+    Raises:
+        TypeCheckError: If mypy is installed but could not be run.
     """
     warnings = []
 
-    # Save code to a temporary file
+    # Save code to a temporary file; passing it as a single argument (-c)
+    # fails with E2BIG for large programs
     with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
         f.write(code)
         temp_file = f.name
 
     try:
-        # Run mypy
+        # A separate process keeps the timeout enforceable and lets
+        # validate_code run the AST checks while mypy works
         result = subprocess.run(
             ["mypy", "--ignore-missing-imports", "--no-error-summary", temp_file],
             capture_output=True,
@@ -178,14 +267,13 @@ def run_type_check(code: str, workspace_root: str) -> tuple[bool, List[str]]:
     except FileNotFoundError:
         # mypy not installed, skip type checking (this is OK)
         return True, []
-    except Exception as e:
-        warnings.append(f"Warning: Error running type check: {e}")
-        return True, warnings
+    except (OSError, subprocess.SubprocessError) as e:
+        raise TypeCheckError(f"Type check could not run: {e}") from e
     finally:
         Path(temp_file).unlink(missing_ok=True)
 
 
-def dry_run_code(code: str, workspace_root: str) -> tuple[bool, List[str]]:
+def dry_run_code(analysis: CodeAnalysis, workspace_root: str) -> tuple[bool, List[str]]:
     """
     Perform a dry-run of the code to check for runtime issues.
     This creates a safe sandbox environment.
@@ -193,26 +281,13 @@ def dry_run_code(code: str, workspace_root: str) -> tuple[bool, List[str]]:
     Returns:
         (passed, warnings)
     """
-    warnings = []
-
-    # For now, we'll just check that the code can be imported
+    # For now, we'll just check for potentially dangerous operations
     # A full dry-run would require mocking the Agent and all tools
-    try:
-        # Check for potentially dangerous operations
-        tree = ast.parse(code)
-        for node in ast.walk(tree):
-            # Check for file operations
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Attribute):
-                    if node.func.attr in ["unlink", "rmdir", "remove", "rmtree"]:
-                        warnings.append(
-                            "Warning: Code contains file deletion operations - ensure they're safe"
-                        )
-
-        return True, warnings
-    except Exception as e:
-        warnings.append(f"Warning: Error during dry-run: {e}")
-        return True, warnings
+    warnings = [
+        "Warning: Code contains file deletion operations - ensure they're safe"
+    ] * analysis.deletion_calls
+
+    return True, warnings
 
 
 def validate_code(code: str, workspace_root: str) -> ValidationResult:
@@ -229,20 +304,34 @@ def validate_code(code: str, workspace_root: str) -> ValidationResult:
     all_errors = []
     all_warnings = []
 
-    # 1. Syntax check
-    syntax_valid, syntax_errors = validate_python_syntax(code)
-    all_errors.extend(syntax_errors)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Start the type check first: the thread only waits on the mypy
+        # process, so the AST checks below run in the meantime
+        type_check = executor.submit(run_type_check, code, workspace_root)
 
-    # 2. Import check
-    imports_valid, import_warnings = check_imports(code)
-    all_warnings.extend(import_warnings)
+        # Parse once; the syntax, import and dry-run checks share the result
+        analysis = _analyze(code)
 
-    # 3. Type check
-    type_check_passed, type_warnings = run_type_check(code, workspace_root)
-    all_warnings.extend(type_warnings)
+        # 1. Syntax check
+        syntax_valid, syntax_errors = validate_python_syntax(analysis)
+        all_errors.extend(syntax_errors)
+
+        # 2. Import check
+        imports_valid, import_warnings = check_imports(analysis)
+        all_warnings.extend(import_warnings)
 
-    # 4. Dry run
-    dry_run_passed, dry_run_warnings = dry_run_code(code, workspace_root)
+        # 3. Dry run
+        dry_run_passed, dry_run_warnings = dry_run_code(analysis, workspace_root)
+
+        # 4. Type check, started above; not being able to run mypy at all is
+        # an error rather than a silently skipped check
+        try:
+            type_check_passed, type_warnings = type_check.result()
+        except TypeCheckError as e:
+            type_check_passed, type_warnings = False, []
+            all_errors.append(str(e))
+
+    all_warnings.extend(type_warnings)
     all_warnings.extend(dry_run_warnings)
 
     success = syntax_valid and len(all_errors) == 0
@@ -287,20 +376,10 @@ def convert_prompt_to_code_v2(
             # Stage 1: Create specification
             print("\n📋 Stage 1: Creating program specification...")
             spec = session.run(
-                f"""Analyze this prompt and create a detailed specification for an SDK program:
-
-{prompt_content}
-
-Create a specification that includes:
-1. Purpose: What the program should accomplish
-2. Input requirements: What data/files it needs
-3. Output requirements: What it should produce
-4. Stages: Sequential steps in the workflow
-5. Data structures: Any dataclasses or types needed
-6. Test strategy: How to validate it works (WITHOUT modifying real user data)
-7. Safety considerations: What could go wrong and how to prevent it
+                f"""{SPEC_INSTRUCTIONS}
 
-Return the specification as a JSON object.""",
+PROMPT:
+{prompt_content}""",
                 return_type=dict,
                 timeout=timeout,
             )
@@ -327,26 +406,13 @@ Return the specification as a JSON object.""",
             # Stage 2: Implement
             print("\n💻 Stage 2: Implementing SDK program...")
 
-            implementation_prompt = f"""Based on this specification, implement a complete Python program using the Augment SDK:
+            implementation_prompt = f"""{IMPLEMENTATION_INSTRUCTIONS}
 
 SPECIFICATION:
 {json.dumps(spec, indent=2)}
 
 ORIGINAL PROMPT:
-{prompt_content}
-
-REQUIREMENTS:
-1. Use `from auggie_sdk import Auggie` for imports
-2. Initialize agent with: `agent = Auggie()` or `agent = Auggie(workspace_root=".")`
-3. Use `agent.run(prompt)` or `agent.run(prompt, return_type=Type)` - DO NOT call agent() directly
-4. Use `agent.session()` for multi-step workflows with shared context
-5. Include proper error handling
-6. Add a main() function that can be run directly
-7. Include docstrings and comments
-8. Follow the test strategy from the spec to ensure safety
-9. Start with #!/usr/bin/env python3 and a module docstring
-
-Generate ONLY the complete Python code, no explanations."""
+{prompt_content}"""
 
             code = session.run(implementation_prompt, return_type=str, timeout=timeout)
 
@@ -357,6 +423,7 @@ Generate ONLY the complete Python code, no explanations."""
 
             iteration = 0
             validation = None
+            validated_code = None
 
             while iteration < max_iterations:
                 iteration += 1
@@ -364,6 +431,7 @@ Generate ONLY the complete Python code, no explanations."""
 
                 # Validate the code
                 validation = validate_code(code, workspace_root)
+                validated_code = code
 
                 print(f"   - Syntax valid: {'✅' if validation.syntax_valid else '❌'}")
                 print(
@@ -390,7 +458,7 @@ Generate ONLY the complete Python code, no explanations."""
                 if iteration < max_iterations:
                     print("   🔧 Fixing issues...")
 
-                    fix_prompt = f"""The generated code has validation errors. Please fix them:
+                    fix_prompt = f"""{FIX_INSTRUCTIONS}
 
 ERRORS:
 {chr(10).join(validation.errors)}
@@ -401,9 +469,7 @@ WARNINGS:
 CURRENT CODE:
 ```python
 {code}
-```
-
-Fix all errors and return the corrected code. Return ONLY the complete Python code, no explanations."""
+```"""
 
                     code = session.run(fix_prompt, return_type=str, timeout=timeout)
                     print(f"   ✅ Code updated ({len(code)} chars)")
@@ -412,24 +478,20 @@ Fix all errors and return the corrected code. Return ONLY the complete Python co
             if validation and validation.success:
                 print("\n✨ Stage 4: Final cleanup and polish...")
 
-                cleanup_prompt = f"""Polish this working SDK program for production use:
+                cleanup_prompt = f"""{CLEANUP_INSTRUCTIONS}
 
-{code}
-
-Improvements to make:
-1. Ensure all docstrings are clear and complete
-2. Add helpful comments for complex logic
-3. Ensure error messages are user-friendly
-4. Verify the code follows Python best practices
-5. Make sure the test strategy from the spec is implemented
-
-Return ONLY the polished Python code, no explanations."""
+{code}"""
 
                 code = session.run(cleanup_prompt, return_type=str, timeout=timeout)
                 print("   ✅ Code polished and ready!")
 
-            # Final validation
-            final_validation = validate_code(code, workspace_root)
+            # Final validation, unless the code is exactly what the last
+            # iteration already validated (iterations ran out, or the polish
+            # returned it unchanged)
+            if code == validated_code:
+                final_validation = validation
+            else:
+                final_validation = validate_code(code, workspace_root)
 
             print("\n" + "=" * 80)
             print("CONVERSION COMPLETE")
@@ -526,7 +588,16 @@ def main():
         print(f"❌ Error: Prompt file not found: {prompt_file}", file=sys.stderr)
         sys.exit(1)
 
-    prompt_content = prompt_file.read_text()
+    size = prompt_file.stat().st_size
+    if size > MAX_PROMPT_BYTES:
+        print(
+            f"❌ Error: Prompt file is too large ({size} bytes, limit {MAX_PROMPT_BYTES})",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    with prompt_file.open("r", encoding="utf-8") as f:
+        prompt_content = f.read()
 
     # Convert
     result = convert_prompt_to_code_v2(
@@ -3,13 +3,8 @@
 Example demonstrating session context manager usage.
 """
 
-import sys
-from pathlib import Path
 from dataclasses import dataclass
 
-# Add the parent directory to the path so we can import auggie_sdk
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
 from auggie_sdk import Auggie
 
 